@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import bookings, users, hotels, rooms, auth, dashboard
+from app.api.endpoints import bookings, users, hotels, rooms, auth, dashboard, search, exports
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -9,3 +9,5 @@ api_router.include_router(hotels.router, prefix="/hotels", tags=["hotels"])
 api_router.include_router(rooms.router, prefix="/rooms", tags=["rooms"])
 api_router.include_router(bookings.router, prefix="/reservations", tags=["reservations"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
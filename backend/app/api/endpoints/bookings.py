@@ -1,14 +1,33 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List
-from app.models.booking import ReservationCreate, ReservationUpdate, ReservationResponse
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from typing import List, Optional
+from bson import ObjectId
+from app.models.booking import (
+    ReservationCreate, ReservationUpdate, ReservationResponse, BulkReservationRequest, BulkReservationResponse
+)
 from app.models.room import RoomResponse
+from app.models.batch import BatchRequest, BatchResponse
+from app.models.inventory import HotelCapacityResponse
 from app.models.user import User
-from app.services.booking_service import ReservationService
+from app.services.booking_service import ReservationService, RESERVATION_EXPANSIONS
+from app.services.user_service import UserService
 from app.core.dependencies import get_current_active_user, get_admin_user
+from app.core.pagination import cursor_param, set_next_cursor, set_total_count
+from app.core.fields import Fields, fields_param, expand_param, selected_fields, with_fields
+from app.core.responses import fields_response
+from app.core.config import settings
+from app.core.dates import parse_date_range
 
 router = APIRouter()
 
 
+def hide_hidden_visitors(reservations, current_user: User) -> None:
+    """Blank expanded visitors the current user may not view (as GET /users/{id} would refuse)"""
+    for reservation in reservations:
+        visitor = getattr(reservation, "visitor", None)
+        if visitor is not None and not UserService.is_visible_to(visitor, current_user):
+            reservation.visitor = None
+
+
 @router.post("/", response_model=ReservationResponse, status_code=201)
 async def create_reservation(
     reservation: ReservationCreate,
@@ -39,10 +58,58 @@ async def create_reservation(
     return created_reservation
 
 
+@router.post("/bulk", response_model=BulkReservationResponse)
+async def create_reservations_bulk(
+    request: BulkReservationRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Create up to 100 reservations in one call (Authentication required)
+    
+    **Access Level:** Authenticated users
+    **Business Logic:**
+    - Users can create reservations for themselves
+    - Admins can create reservations for any user
+    - Each item gets its own result; with all_or_nothing, one failure fails the whole batch
+    """
+    if current_user.role == "viewer":
+        if any(item.visitor_id != str(current_user.id) for item in request.items):
+            raise HTTPException(
+                status_code=403,
+                detail="Users can only create reservations for themselves"
+            )
+    
+    return await ReservationService.create_reservations_bulk(
+        request.items, all_or_nothing=request.all_or_nothing
+    )
+
+
+@router.post("/batch", response_model=BatchResponse[ReservationResponse])
+async def get_reservations_batch(
+    request: BatchRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get up to 100 reservations by ID in one call
+    
+    **Access Level:** Authenticated users
+    **Business Logic:**
+    - Same visibility as GET /reservations/{reservation_id}: viewers see their own,
+      hotel admins their hotel's, super admins all reservations
+    - Reservations come back in request order; unknown and hidden ids are listed in `missing`
+    """
+    return await ReservationService.get_reservations_by_ids(request.ids, visible_to=current_user)
+
+
 @router.get("/", response_model=List[ReservationResponse])
 async def get_reservations(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(ReservationResponse)),
+    expand: Optional[Fields] = Depends(expand_param(RESERVATION_EXPANSIONS)),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -53,18 +120,36 @@ async def get_reservations(
     - Hotel admins can only see reservations from their hotel
     - Super admins can see all reservations
     """
+    selected = selected_fields(ReservationResponse, fields, expand)
+    
     # Hotel admins can only see reservations from their hotel
     if current_user.role == "admin_hotel" and current_user.hotel_id:
-        return await ReservationService.get_reservations_by_hotel(current_user.hotel_id, skip=skip, limit=limit)
+        reservations = await ReservationService.get_reservations_by_hotel(
+            current_user.hotel_id, skip=skip, limit=limit, after_id=after_id, fields=selected, expand=expand,
+            include_total=include_total
+        )
+    else:
+        # Super admin can see all reservations
+        reservations = await ReservationService.get_reservations(
+            skip=skip, limit=limit, after_id=after_id, fields=selected, expand=expand,
+            include_total=include_total
+        )
     
-    # Super admin can see all reservations
-    return await ReservationService.get_reservations(skip=skip, limit=limit)
+    hide_hidden_visitors(reservations, current_user)
+    set_next_cursor(response, reservations, limit)
+    set_total_count(response, reservations)
+    return fields_response(reservations, selected, response)
 
 
 @router.get("/my-reservations", response_model=List[ReservationResponse])
 async def get_my_reservations(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(ReservationResponse)),
+    expand: Optional[Fields] = Depends(expand_param(RESERVATION_EXPANSIONS)),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -73,12 +158,22 @@ async def get_my_reservations(
     **Access Level:** Authenticated users
     **Business Logic:** Users can view their own reservations
     """
-    return await ReservationService.get_reservations_by_user(str(current_user.id), skip=skip, limit=limit)
+    selected = selected_fields(ReservationResponse, fields, expand)
+    reservations = await ReservationService.get_reservations_by_user(
+        str(current_user.id), skip=skip, limit=limit, after_id=after_id, fields=selected, expand=expand,
+        include_total=include_total
+    )
+    hide_hidden_visitors(reservations, current_user)
+    set_next_cursor(response, reservations, limit)
+    set_total_count(response, reservations)
+    return fields_response(reservations, selected, response)
 
 
 @router.get("/{reservation_id}", response_model=ReservationResponse)
 async def get_reservation(
     reservation_id: str,
+    fields: Optional[Fields] = Depends(fields_param(ReservationResponse)),
+    expand: Optional[Fields] = Depends(expand_param(RESERVATION_EXPANSIONS)),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -89,7 +184,11 @@ async def get_reservation(
     - Users can view their own reservations
     - Admins can view reservations from their hotel (hotel admin) or all reservations (super admin)
     """
-    reservation = await ReservationService.get_reservation(reservation_id)
+    # visitor_id and hotel_id are always read for the access checks below
+    selected = selected_fields(ReservationResponse, fields, expand)
+    reservation = await ReservationService.get_reservation(
+        reservation_id, fields=with_fields(selected, ["visitor_id", "hotel_id"]), expand=expand
+    )
     if not reservation:
         raise HTTPException(status_code=404, detail="Reservation not found")
     
@@ -105,7 +204,8 @@ async def get_reservation(
     
     # Super admin can view any reservation (no additional checks needed)
     
-    return reservation
+    hide_hidden_visitors([reservation], current_user)
+    return fields_response(reservation, selected)
 
 
 @router.put("/{reservation_id}", response_model=ReservationResponse)
@@ -186,8 +286,13 @@ async def delete_reservation(
 @router.get("/hotel/{hotel_id}", response_model=List[ReservationResponse])
 async def get_reservations_by_hotel(
     hotel_id: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(ReservationResponse)),
+    expand: Optional[Fields] = Depends(expand_param(RESERVATION_EXPANSIONS)),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -203,14 +308,27 @@ async def get_reservations_by_hotel(
         if current_user.hotel_id != hotel_id:
             raise HTTPException(status_code=403, detail="Not authorized to view reservations from this hotel")
     
-    return await ReservationService.get_reservations_by_hotel(hotel_id, skip=skip, limit=limit)
+    selected = selected_fields(ReservationResponse, fields, expand)
+    reservations = await ReservationService.get_reservations_by_hotel(
+        hotel_id, skip=skip, limit=limit, after_id=after_id, fields=selected, expand=expand,
+        include_total=include_total
+    )
+    hide_hidden_visitors(reservations, current_user)
+    set_next_cursor(response, reservations, limit)
+    set_total_count(response, reservations)
+    return fields_response(reservations, selected, response)
 
 
 @router.get("/user/{user_id}", response_model=List[ReservationResponse])
 async def get_reservations_by_user(
     user_id: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(ReservationResponse)),
+    expand: Optional[Fields] = Depends(expand_param(RESERVATION_EXPANSIONS)),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -235,7 +353,15 @@ async def get_reservations_by_user(
     
     # Super admin can view any user's reservations (no additional checks needed)
     
-    return await ReservationService.get_reservations_by_user(user_id, skip=skip, limit=limit)
+    selected = selected_fields(ReservationResponse, fields, expand)
+    reservations = await ReservationService.get_reservations_by_user(
+        user_id, skip=skip, limit=limit, after_id=after_id, fields=selected, expand=expand,
+        include_total=include_total
+    )
+    hide_hidden_visitors(reservations, current_user)
+    set_next_cursor(response, reservations, limit)
+    set_total_count(response, reservations)
+    return fields_response(reservations, selected, response)
 
 
 @router.get("/available-rooms/{hotel_id}", response_model=List[RoomResponse])
@@ -260,3 +386,28 @@ async def get_available_rooms(
             status_code=400,
             detail=f"Error getting available rooms: {str(e)}"
         )
+
+
+@router.get("/capacity/{hotel_id}", response_model=HotelCapacityResponse)
+async def get_hotel_capacity(
+    hotel_id: str,
+    start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
+    end_date: str = Query(..., description="End date in YYYY-MM-DD format")
+):
+    """
+    Get the hotel's remaining reservation capacity for a date range (Public access)
+    
+    **Access Level:** Public
+    **Business Logic:** Remaining capacity is the hotel's max_reservations_capacity minus
+    the busiest night of the range, read from the hotel's room-night ledger;
+    the range is limited to TIMESERIES_MAX_DAYS days
+    """
+    try:
+        parse_date_range(start_date, end_date, settings.TIMESERIES_MAX_DAYS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    capacity = await ReservationService.get_remaining_capacity(hotel_id, start_date, end_date)
+    if not capacity:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return capacity
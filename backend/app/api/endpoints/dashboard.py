@@ -1,34 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.models.user import User
-from app.services.user_service import UserService
+from app.models.dashboard import DashboardStats, HotelAdminDashboardStats
+from app.models.rollup import TimeseriesGranularity, TimeseriesResponse
 from app.services.hotel_service import HotelService
-from app.services.booking_service import ReservationService
-from app.core.dependencies import get_admin_user
-from datetime import datetime, timedelta
+from app.core.dependencies import get_admin_user, get_super_admin_user
+from app.core.metrics import booking_latency
+from app.services.booking_service import availability_cache
+from app.services.dashboard_service import DashboardService
+from app.services.rollup_service import RollupService
+from app.core.config import settings
 from app.core.dependencies import get_hotel_admin_user
 
 
 router = APIRouter()
 
 
-class DashboardStats(BaseModel):
-    total_users: int
-    total_hotels: int
-    total_bookings: int
-    total_revenue: float
-    active_hotels: int
-    pending_bookings: int
-    recent_activity: list[Dict[str, Any]]
-
-
-class HotelAdminDashboardStats(BaseModel):
-    my_hotels: int
-    total_reservations: int
-    recent_activity: list[Dict[str, Any]]
-
-
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
     current_user: User = Depends(get_admin_user)
@@ -37,130 +25,15 @@ async def get_dashboard_stats(
     Get dashboard statistics (Admin access required)
     
     **Access Level:** Admin (hotel admin or super admin)
-    **Returns:** Dashboard statistics including users, hotels, bookings, and revenue
+    **Returns:** Dashboard statistics including users, hotels, bookings, and revenue,
+    read from the incrementally maintained stats counters
     """
     try:
-        # Get all users (filtered by hotel for hotel admins)
-        if current_user.role == "admin_hotel" and current_user.hotel_id:
-            users = await UserService.get_users_by_hotel(current_user.hotel_id, skip=0, limit=10000)
-        else:
-            users = await UserService.get_users(skip=0, limit=10000)
-        
-        # Get hotels (all for super admin, created hotels for hotel admin)
-        if current_user.role == "admin_hotel":
-            # Hotel admin sees only hotels they created
-            hotels = await HotelService.get_hotels_by_creator(str(current_user.id))
-        else:
-            # Super admin sees all hotels
-            hotels = await HotelService.get_hotels(skip=0, limit=10000, active_only=False)
-        
-        # Get all reservations
-        if current_user.role == "admin_hotel":
-            # Get all hotels created by this hotel admin
-            admin_hotels = await HotelService.get_hotels_by_creator(str(current_user.id))
-            reservations = []
-            
-            # Get reservations for all hotels created by this admin
-            for hotel in admin_hotels:
-                hotel_reservations = await ReservationService.get_reservations_by_hotel(
-                    str(hotel.id), skip=0, limit=10000
-                )
-                reservations.extend(hotel_reservations)
-        else:
-            reservations = await ReservationService.get_reservations(skip=0, limit=10000)
-        
-        # Calculate statistics
-        total_users = len(users)
-        total_hotels = len(hotels)
-        total_bookings = len(reservations)
-        active_hotels = len([h for h in hotels if h.is_active])
-        pending_bookings = len([r for r in reservations if r.status == "pending"])
-        
-        # Calculate total revenue
-        total_revenue = sum(reservation.total_price for reservation in reservations)
-        
-        # Generate recent activity (mock data for now, can be enhanced later)
-        recent_activity = []
-        
-        # Add recent user registrations
-        recent_users = sorted(users, key=lambda x: x.created_at, reverse=True)[:3]
-        for user in recent_users:
-            time_ago = _time_ago(user.created_at)
-            recent_activity.append({
-                "type": "user_registration",
-                "title": "New user registration",
-                "description": f"{user.name} ({user.email}) joined",
-                "time": time_ago,
-                "icon": "users",
-                "created_at": user.created_at  # Add for proper sorting
-            })
-        
-        # Add recent hotel additions
-        recent_hotels = sorted(hotels, key=lambda x: x.created_at, reverse=True)[:2]
-        for hotel in recent_hotels:
-            time_ago = _time_ago(hotel.created_at)
-            recent_activity.append({
-                "type": "hotel_added",
-                "title": "New hotel added",
-                "description": f"{hotel.name} in {hotel.city}",
-                "time": time_ago,
-                "icon": "building",
-                "created_at": hotel.created_at  # Add for proper sorting
-            })
-        
-        # Add recent bookings
-        recent_reservations = sorted(reservations, key=lambda x: x.created_at, reverse=True)[:3]
-        for reservation in recent_reservations:
-            time_ago = _time_ago(reservation.created_at)
-            recent_activity.append({
-                "type": "booking_created",
-                "title": "New booking",
-                "description": f"Reservation for ${reservation.total_price}",
-                "time": time_ago,
-                "icon": "calendar",
-                "created_at": reservation.created_at  # Add for proper sorting
-            })
-        
-        # Sort recent activity by actual datetime (most recent first) and limit to 5 items
-        recent_activity.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        # Remove the created_at field before returning (it was just for sorting)
-        for activity in recent_activity:
-            del activity["created_at"]
-            
-        recent_activity = recent_activity[:5]
-        
-        return DashboardStats(
-            total_users=total_users,
-            total_hotels=total_hotels,
-            total_bookings=total_bookings,
-            total_revenue=total_revenue,
-            active_hotels=active_hotels,
-            pending_bookings=pending_bookings,
-            recent_activity=recent_activity
-        )
-        
+        return await DashboardService.get_stats(current_user)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching dashboard stats: {str(e)}")
 
 
-def _time_ago(created_at: datetime) -> str:
-    """Helper function to calculate time ago"""
-    now = datetime.utcnow()
-    diff = now - created_at
-    total_seconds = int(diff.total_seconds())
-    
-    if diff.days > 0:
-        return f"{diff.days}d ago"
-    elif total_seconds > 3600:
-        hours = total_seconds // 3600
-        return f"{hours}h ago"
-    elif total_seconds > 60:
-        minutes = total_seconds // 60
-        return f"{minutes}m ago"
-    else:   
-        return "Just now"
-
 @router.get("/hotel-admin", response_model=HotelAdminDashboardStats)  
 async def get_hotel_admin_dashboard_stats(
     current_user: User = Depends(get_hotel_admin_user)
@@ -168,71 +41,67 @@ async def get_hotel_admin_dashboard_stats(
     if current_user.role != "admin_hotel":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    try:               
-        # Get all hotels created by this hotel admin
-        hotels = await HotelService.get_hotels_by_creator(str(current_user.id))
-        
-        # Get reservations for all hotels created by this admin
-        reservations = []
-        for hotel in hotels:
-            hotel_reservations = await ReservationService.get_reservations_by_hotel(
-                str(hotel.id), skip=0, limit=10000
-            )
-            reservations.extend(hotel_reservations)
-            
-        total_hotels = len(hotels)
-        total_reservations = len(reservations)
-
-        recent_activity = generate_hotel_admin_recent_activity(reservations, hotels)
-
-        return HotelAdminDashboardStats(
-            my_hotels=total_hotels,
-            total_reservations=total_reservations,
-            recent_activity=recent_activity
-
-       )
+    try:
+        return await DashboardService.get_hotel_admin_stats(current_user)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching hotel admin dashboard stats: {str(e)}")
+
+
+@router.get("/timeseries", response_model=TimeseriesResponse)
+async def get_dashboard_timeseries(
+    start_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$", description="First day (YYYY-MM-DD)"),
+    end_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$", description="Last day, inclusive (YYYY-MM-DD)"),
+    granularity: TimeseriesGranularity = Query(TimeseriesGranularity.DAY, description="day, week or month"),
+    hotel_id: Optional[str] = Query(None, description="Limit to one hotel"),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Get revenue and occupied room-nights per day, week or month (Admin access required)
     
-def generate_hotel_admin_recent_activity(reservations, hotels):
-    recent_activity = []
-    
-    # Add recent reservations (last 5)
-    recent_reservations = sorted(reservations, key=lambda x: x.created_at, reverse=True)[:5]
-    for reservation in recent_reservations:
-        # Find which hotel this reservation belongs to
-        hotel = next((h for h in hotels if str(h.id) == str(reservation.hotel_id)), None)
-        hotel_name = hotel.name if hotel else "Unknown Hotel"
-        
-        time_ago = _time_ago(reservation.created_at)
-        recent_activity.append({
-            "type": "reservation_created",
-            "title": "New reservation",
-            "description": f"${reservation.total_price} booking at {hotel_name}",
-            "time": time_ago,
-            "icon": "calendar",
-            "created_at": reservation.created_at  # Add for proper sorting
-        })
-    
-    # Add recent hotel additions (last 2)
-    recent_hotels = sorted(hotels, key=lambda x: x.created_at, reverse=True)[:2]
-    for hotel in recent_hotels:
-        time_ago = _time_ago(hotel.created_at)
-        recent_activity.append({
-            "type": "hotel_added",
-            "title": "Hotel added",
-            "description": f"{hotel.name} in {hotel.city}",
-            "time": time_ago,
-            "icon": "building",
-            "created_at": hotel.created_at  # Add for proper sorting
-        })
-    
-    # Sort by actual datetime (most recent first) and limit to 6 most recent activities
-    recent_activity.sort(key=lambda x: x["created_at"], reverse=True)
+    **Access Level:** Admin (hotel admin or super admin)
+    **Business Logic:**
+    - Read from per-hotel daily rollups, so cost follows the window, not the booking history
+    - Confirmed, checked-in and checked-out stays count; revenue is spread over the nights
+    - Rollups refresh every ROLLUP_REFRESH_INTERVAL_SECONDS, so recent bookings may lag by that much
+    - Hotel admins see the hotels they created (or one of them with hotel_id)
+    - Super admins see every hotel (or one with hotel_id)
+    """
+    try:
+        first, last = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date")
+    if last < first:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (last - first).days >= settings.TIMESERIES_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Window cannot exceed {settings.TIMESERIES_MAX_DAYS} days")
     
-    # Remove the created_at field before returning (it was just for sorting)
-    for activity in recent_activity:
-        del activity["created_at"]
+    hotel_ids = None
+    if hotel_id:
+        hotel = await HotelService.get_hotel(hotel_id)
+        if not hotel:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        if current_user.role == "admin_hotel" and hotel.created_by != str(current_user.id):
+            raise HTTPException(status_code=403, detail="Hotel admin can only view their own hotels")
+        hotel_ids = [hotel_id]
+    elif current_user.role == "admin_hotel":
+        hotels = await HotelService.get_hotels_by_creator(str(current_user.id))
+        hotel_ids = [hotel.id for hotel in hotels]
     
-    return recent_activity[:6]
+    return await RollupService.get_timeseries(start_date, end_date, granularity, hotel_ids)
+
+
+@router.get("/metrics")
+async def get_performance_metrics(
+    current_user: User = Depends(get_super_admin_user)
+):
+    """
+    Get in-process performance metrics (Super admin access required)
     
+    **Access Level:** Super admin only
+    **Returns:** p50/p99 latency per reservation creation stage over the recent window
+    and hit/miss counters of the availability cache
+    """
+    return {
+        "booking_latency": booking_latency.summary(),
+        "availability_cache": availability_cache.stats()
+    }
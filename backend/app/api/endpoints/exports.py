@@ -0,0 +1,135 @@
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+from app.core.dates import parse_date
+from app.models.booking import ReservationStatus
+from app.models.user import User
+from app.services.export_service import ExportService
+from app.core.dependencies import get_admin_user, get_super_admin_user
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+def _export_response(chunks: AsyncIterator[str], name: str, format: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
+
+
+def _validate_dates(start_date: Optional[str], end_date: Optional[str]) -> None:
+    try:
+        for value in (start_date, end_date):
+            if value:
+                parse_date(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+
+
+async def _scoped_hotel_ids(current_user: User, hotel_id: Optional[str]) -> Optional[list]:
+    """Hotels a hotel admin may export from (None means unrestricted)"""
+    if current_user.role != "admin_hotel":
+        return None
+    hotel_ids = await ExportService.get_hotel_ids_by_creator(str(current_user.id))
+    if hotel_id and hotel_id not in hotel_ids:
+        raise HTTPException(status_code=403, detail="Hotel admin can only export data from their own hotels")
+    return hotel_ids
+
+
+@router.get("/reservations")
+async def export_reservations(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    hotel_id: Optional[str] = Query(None, description="Filter by hotel"),
+    status: Optional[ReservationStatus] = Query(None, description="Filter by status"),
+    start_date: Optional[str] = Query(None, description="Stays ending on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Stays starting on or before this date (YYYY-MM-DD)"),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Stream reservations as NDJSON or CSV (Admin access required)
+    
+    **Access Level:** Admin (hotel admin or super admin)
+    **Business Logic:**
+    - Hotel admins can only export reservations from hotels they own
+    - Super admins can export all reservations
+    """
+    _validate_dates(start_date, end_date)
+    hotel_ids = await _scoped_hotel_ids(current_user, hotel_id)
+    chunks = ExportService.export_reservations(
+        format,
+        hotel_id=hotel_id,
+        hotel_ids=hotel_ids,
+        status=status.value if status else None,
+        start_date=start_date,
+        end_date=end_date
+    )
+    return _export_response(chunks, "reservations", format)
+
+
+@router.get("/hotels")
+async def export_hotels(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: Optional[str] = Query(None, description="Created on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Created before this date (YYYY-MM-DD)"),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Stream hotels as NDJSON or CSV (Admin access required)
+    
+    **Access Level:** Admin (hotel admin or super admin)
+    **Business Logic:**
+    - Hotel admins can only export hotels they own
+    - Super admins can export all hotels
+    """
+    _validate_dates(start_date, end_date)
+    created_by = str(current_user.id) if current_user.role == "admin_hotel" else None
+    chunks = ExportService.export_hotels(format, created_by=created_by, start_date=start_date, end_date=end_date)
+    return _export_response(chunks, "hotels", format)
+
+
+@router.get("/rooms")
+async def export_rooms(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    hotel_id: Optional[str] = Query(None, description="Filter by hotel"),
+    start_date: Optional[str] = Query(None, description="Created on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Created before this date (YYYY-MM-DD)"),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Stream rooms as NDJSON or CSV (Admin access required)
+    
+    **Access Level:** Admin (hotel admin or super admin)
+    **Business Logic:**
+    - Hotel admins can only export rooms from hotels they own
+    - Super admins can export all rooms
+    """
+    _validate_dates(start_date, end_date)
+    hotel_ids = await _scoped_hotel_ids(current_user, hotel_id)
+    chunks = ExportService.export_rooms(
+        format, hotel_id=hotel_id, hotel_ids=hotel_ids, start_date=start_date, end_date=end_date
+    )
+    return _export_response(chunks, "rooms", format)
+
+
+@router.get("/users")
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    hotel_id: Optional[str] = Query(None, description="Filter by hotel"),
+    start_date: Optional[str] = Query(None, description="Created on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Created before this date (YYYY-MM-DD)"),
+    current_user: User = Depends(get_super_admin_user)
+):
+    """
+    Stream users as NDJSON or CSV (Super admin access required)
+    
+    **Access Level:** Super admin only
+    """
+    _validate_dates(start_date, end_date)
+    chunks = ExportService.export_users(format, hotel_id=hotel_id, start_date=start_date, end_date=end_date)
+    return _export_response(chunks, "users", format)
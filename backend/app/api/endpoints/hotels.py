@@ -1,9 +1,19 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Response
 from typing import List, Optional
+from bson import ObjectId
 from app.models.hotel import Hotel, HotelCreate, HotelUpdate, HotelResponse
 from app.models.user import User
+from app.models.occupancy import OccupancyCalendar
+from app.models.batch import BatchRequest, BatchResponse
 from app.services.hotel_service import HotelService
+from app.services.occupancy_service import OccupancyService
 from app.core.dependencies import get_current_user_optional, get_admin_user, get_current_active_user, get_hotel_admin_user
+from app.core.pagination import cursor_param, set_next_cursor, set_total_count
+from app.core.fields import Fields, fields_param
+from app.core.responses import (
+    ETAG_HEADER, cached_json_response, etag_matches, fields_response, not_modified, versioned_etag
+)
+from app.services.revision_service import RevisionService, HOTELS_SCOPE
 
 router = APIRouter()
 
@@ -48,9 +58,14 @@ async def create_hotel(
 
 @router.get("/", response_model=List[HotelResponse])
 async def get_hotels(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
     active_only: bool = Query(True),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(HotelResponse)),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -60,17 +75,76 @@ async def get_hotels(
     **Enhanced Features for Authenticated Users:**
     - May include additional hotel details in future
     - Different filtering options based on user role
+    
+    Responses carry an ETag from the hotels revision counter; a matching
+    If-None-Match gets 304 Not Modified without running the query.
     """
-    return await HotelService.get_hotels(skip=skip, limit=limit, active_only=active_only)
+    etag = versioned_etag((HOTELS_SCOPE,), await RevisionService.current(HOTELS_SCOPE))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    
+    hotels = await HotelService.get_hotels(
+        skip=skip, limit=limit, active_only=active_only, after_id=after_id, fields=fields,
+        include_total=include_total
+    )
+    set_next_cursor(response, hotels, limit)
+    set_total_count(response, hotels)
+    return fields_response(hotels, fields, response)
+
+
+@router.post("/batch", response_model=BatchResponse[HotelResponse])
+async def get_hotels_batch(request: BatchRequest):
+    """
+    Get up to 100 hotels by ID in one call (Public access)
+    
+    **Access Level:** Public
+    **Business Logic:** Hotels come back in request order; unknown ids are listed in `missing`
+    """
+    return await HotelService.get_hotels_by_ids(request.ids)
 
 
 @router.get("/{hotel_id}", response_model=HotelResponse)
-async def get_hotel(hotel_id: str):
-    """Get a specific hotel by ID"""
+async def get_hotel(
+    hotel_id: str,
+    fields: Optional[Fields] = Depends(fields_param(HotelResponse)),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get a specific hotel by ID (ETag from its revision; If-None-Match may get 304)"""
+    response = await cached_json_response(
+        ("hotel", hotel_id),
+        lambda selected: HotelService.get_hotel(hotel_id, fields=selected),
+        lambda: HotelService.get_hotel_revision(hotel_id),
+        if_none_match=if_none_match,
+        fields=fields
+    )
+    if not response:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return response
+
+
+@router.get("/{hotel_id}/occupancy", response_model=OccupancyCalendar)
+async def get_hotel_occupancy(
+    hotel_id: str,
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Month in YYYY-MM format"),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Get the room-by-night occupancy grid of a hotel for one month (Admin access required)
+    
+    **Access Level:** Admin (hotel admin or super admin)
+    **Business Logic:**
+    - Hotel admins can only view the occupancy of hotels they own
+    - Each room comes back as a night bitmask plus [first_day, nights] runs
+    """
     hotel = await HotelService.get_hotel(hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    return hotel
+    
+    if current_user.role == "admin_hotel" and hotel.created_by != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Hotel admin can only view their own hotels")
+    
+    return await OccupancyService.get_month_occupancy(hotel_id, month)
 
 
 @router.put("/{hotel_id}", response_model=HotelResponse)
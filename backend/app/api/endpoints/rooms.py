@@ -1,9 +1,17 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Response
+from typing import List, Optional
+from bson import ObjectId
 from app.models.room import RoomCreate, RoomUpdate, RoomResponse
 from app.models.user import User
+from app.models.batch import BatchRequest, BatchResponse
 from app.services.room_service import RoomService
 from app.core.dependencies import get_current_user_optional, get_admin_user
+from app.core.pagination import cursor_param, set_next_cursor, set_total_count
+from app.core.fields import Fields, fields_param
+from app.core.responses import (
+    ETAG_HEADER, cached_json_response, etag_matches, fields_response, not_modified, versioned_etag
+)
+from app.services.revision_service import RevisionService, rooms_scope
 
 router = APIRouter()
 
@@ -48,9 +56,13 @@ async def create_room(
 
 @router.get("/", response_model=List[RoomResponse])
 async def get_rooms(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
     available_only: bool = Query(False),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(RoomResponse)),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -60,35 +72,78 @@ async def get_rooms(
     **Enhanced Features for Authenticated Users:**
     - May show additional room details or availability
     """
-    return await RoomService.get_rooms(skip=skip, limit=limit, available_only=available_only)
+    rooms = await RoomService.get_rooms(
+        skip=skip, limit=limit, available_only=available_only, after_id=after_id, fields=fields,
+        include_total=include_total
+    )
+    set_next_cursor(response, rooms, limit)
+    set_total_count(response, rooms)
+    return fields_response(rooms, fields, response)
+
+
+@router.post("/batch", response_model=BatchResponse[RoomResponse])
+async def get_rooms_batch(request: BatchRequest):
+    """
+    Get up to 100 rooms by ID in one call (Public access)
+    
+    **Access Level:** Public
+    **Business Logic:** Rooms come back in request order; unknown ids are listed in `missing`
+    """
+    return await RoomService.get_rooms_by_ids(request.ids)
 
 
 @router.get("/{room_id}", response_model=RoomResponse)
-async def get_room(room_id: str):
+async def get_room(
+    room_id: str,
+    fields: Optional[Fields] = Depends(fields_param(RoomResponse)),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get a specific room by ID (Public access)
     
     **Access Level:** Public
     **Business Logic:** Anyone can view room details for booking purposes
+    
+    Responses carry an ETag from the room's revision; a matching
+    If-None-Match gets 304 Not Modified.
     """
-    room = await RoomService.get_room(room_id)
-    if not room:
+    response = await cached_json_response(
+        ("room", room_id),
+        lambda selected: RoomService.get_room(room_id, fields=selected),
+        lambda: RoomService.get_room_revision(room_id),
+        if_none_match=if_none_match,
+        fields=fields
+    )
+    if not response:
         raise HTTPException(status_code=404, detail="Room not found")
-    return room
+    return response
 
 
 @router.get("/hotel/{hotel_id}", response_model=List[RoomResponse])
 async def get_rooms_by_hotel(
     hotel_id: str,
-    available_only: bool = Query(False)
+    response: Response,
+    available_only: bool = Query(False),
+    fields: Optional[Fields] = Depends(fields_param(RoomResponse)),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get all rooms for a specific hotel (Public access)
     
     **Access Level:** Public
     **Business Logic:** Anyone can view hotel rooms for booking purposes
+    
+    Responses carry an ETag from the hotel's rooms revision counter; a
+    matching If-None-Match gets 304 Not Modified without running the query.
     """
-    return await RoomService.get_rooms_by_hotel(hotel_id, available_only=available_only)
+    scope = rooms_scope(hotel_id)
+    etag = versioned_etag((scope,), await RevisionService.current(scope))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    
+    rooms = await RoomService.get_rooms_by_hotel(hotel_id, available_only=available_only, fields=fields)
+    return fields_response(rooms, fields, response)
 
 
 @router.put("/{room_id}", response_model=RoomResponse)
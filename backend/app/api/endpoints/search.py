@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.core.dates import parse_date
+from app.models.room import RoomType
+from app.models.search import AvailabilitySearchResponse
+from app.services.search_service import SearchService
+
+router = APIRouter()
+
+
+@router.get("/availability", response_model=AvailabilitySearchResponse)
+async def search_availability(
+    start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
+    end_date: str = Query(..., description="End date in YYYY-MM-DD format"),
+    city: Optional[str] = Query(None, description="Filter by city"),
+    country: Optional[str] = Query(None, description="Filter by country"),
+    room_type: Optional[RoomType] = Query(None, description="Filter by room type"),
+    min_occupancy: Optional[int] = Query(None, ge=1, le=10, description="Minimum room occupancy"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Search hotels with free rooms for a stay (Public access)
+    
+    **Access Level:** Public
+    **Business Logic:** Returns active hotels that have at least one available room
+    matching the room type and occupancy for the whole date range, with the number
+    of free rooms and the cheapest nightly price, cheapest hotels first
+    """
+    try:
+        if parse_date(end_date) <= parse_date(start_date):
+            raise HTTPException(status_code=400, detail="End date must be after start date")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+
+    return await SearchService.search_availability(
+        start_date,
+        end_date,
+        city=city,
+        country=country,
+        room_type=room_type,
+        min_occupancy=min_occupancy,
+        skip=skip,
+        limit=limit
+    )
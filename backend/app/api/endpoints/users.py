@@ -1,16 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import List, Optional
+from bson import ObjectId
 from app.models.user import UserCreate, UserUpdate, UserResponse, User
+from app.models.batch import BatchRequest, BatchResponse
 from app.services.user_service import UserService
 from app.core.dependencies import get_current_active_user, get_admin_user, get_super_admin_user
+from app.core.pagination import cursor_param, set_next_cursor, set_total_count
+from app.core.fields import Fields, fields_param, with_fields
+from app.core.responses import fields_response
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(UserResponse)),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -23,15 +32,42 @@ async def get_users(
     """
     # If hotel admin, filter by hotel_id
     if current_user.role == "admin_hotel" and current_user.hotel_id:
-        return await UserService.get_users_by_hotel(current_user.hotel_id, skip=skip, limit=limit)
+        users = await UserService.get_users_by_hotel(
+            current_user.hotel_id, skip=skip, limit=limit, after_id=after_id, fields=fields,
+            include_total=include_total
+        )
+    else:
+        # Super admin can see all users
+        users = await UserService.get_users(
+            skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+        )
     
-    # Super admin can see all users
-    return await UserService.get_users(skip=skip, limit=limit)
+    set_next_cursor(response, users, limit)
+    set_total_count(response, users)
+    return fields_response(users, fields, response)
+
+
+@router.post("/batch", response_model=BatchResponse[UserResponse])
+async def get_users_batch(
+    request: BatchRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get up to 100 users by ID in one call
+    
+    **Access Level:** Authenticated users
+    **Business Logic:**
+    - Same visibility as GET /users/{user_id}: viewers see themselves, hotel admins
+      their hotel's users and themselves, super admins everyone
+    - Users come back in request order; unknown and hidden ids are listed in `missing`
+    """
+    return await UserService.get_users_by_ids(request.ids, visible_to=current_user)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
+    fields: Optional[Fields] = Depends(fields_param(UserResponse)),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -42,7 +78,8 @@ async def get_user(
     - Users can view their own profile
     - Admins can view users from their hotel (hotel admin) or all users (super admin)
     """
-    user = await UserService.get_user(user_id)
+    # hotel_id is always read for the access check below
+    user = await UserService.get_user(user_id, fields=with_fields(fields, ["hotel_id"]))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -58,7 +95,7 @@ async def get_user(
     
     # Super admin can view any user (no additional checks needed)
     
-    return user
+    return fields_response(user, fields)
 
 
 @router.post("/", response_model=UserResponse)
@@ -140,8 +177,12 @@ async def delete_user(
 @router.get("/hotel/{hotel_id}", response_model=List[UserResponse])
 async def get_users_by_hotel(
     hotel_id: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Send the number of matching items in the X-Total-Count header"),
+    after_id: Optional[ObjectId] = Depends(cursor_param),
+    fields: Optional[Fields] = Depends(fields_param(UserResponse)),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -157,4 +198,9 @@ async def get_users_by_hotel(
         if current_user.hotel_id != hotel_id:
             raise HTTPException(status_code=403, detail="Not authorized to view users from this hotel")
     
-    return await UserService.get_users_by_hotel(hotel_id, skip=skip, limit=limit)
+    users = await UserService.get_users_by_hotel(
+        hotel_id, skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+    )
+    set_next_cursor(response, users, limit)
+    set_total_count(response, users)
+    return fields_response(users, fields, response)
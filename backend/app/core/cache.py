@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Bounded least-recently-used map with optional expiry and hit/miss counters"""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or (self.ttl_seconds is not None and entry[1] < time.monotonic()):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else 0
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class VersionedCache:
+    """
+    LRU cache whose entries are tagged with a per-scope version counter
+    
+    Writes bump the version of the scope they touch; entries stored under an
+    older version can no longer be looked up and simply age out of the LRU.
+    Read the version before computing a value and store it with that version,
+    so a write that lands during the computation is never masked.
+    
+    Versions come from one increasing clock and only bumped scopes are
+    tracked, at most max_entries of them (least recently bumped dropped).
+    Untracked scopes read the floor, the newest version ever dropped, so a
+    dropped scope never falls back to a version its stale entries carry.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self._cache = LRUCache(max_entries, ttl_seconds)
+        self._versions: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._max_scopes = max(max_entries, 1)
+        self._clock = 0
+        self._floor = 0
+
+    def version(self, scope: Hashable) -> int:
+        return self._versions.get(scope, self._floor)
+
+    def get(self, scope: Hashable, key: Hashable) -> Optional[Any]:
+        return self._cache.get((scope, self.version(scope), key))
+
+    def set(self, scope: Hashable, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        self._cache.set((scope, self.version(scope) if version is None else version, key), value)
+
+    def bump(self, scope: Hashable) -> None:
+        self._clock += 1
+        self._versions[scope] = self._clock
+        self._versions.move_to_end(scope)
+        while len(self._versions) > self._max_scopes:
+            _, dropped = self._versions.popitem(last=False)
+            self._floor = max(self._floor, dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "scopes": len(self._versions)}
@@ -26,6 +26,44 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # In-process availability index (only safe with a single API worker)
+    AVAILABILITY_INDEX_ENABLED: bool = False
+    # Cross-check every index answer against MongoDB and log mismatches
+    AVAILABILITY_INDEX_VERIFY: bool = False
+    
+    # Public availability cache; versions are per process, so the TTL bounds
+    # how long another worker's writes can go unnoticed (0 entries disables it)
+    AVAILABILITY_CACHE_SIZE: int = 10000
+    AVAILABILITY_CACHE_TTL_SECONDS: float = 30
+    
+    # Serialized hotel/room detail responses, dropped on writes from this process
+    SERIALIZED_CACHE_SIZE: int = 5000
+    SERIALIZED_CACHE_TTL_SECONDS: float = 30
+    
+    # Trimmed response model classes kept for ?fields= subsets (least recently used evicted)
+    SPARSE_MODEL_CACHE_SIZE: int = 256
+    
+    # Cached list totals (?include_total=true) per collection and filter
+    COUNT_CACHE_SIZE: int = 1000
+    COUNT_CACHE_TTL_SECONDS: float = 10
+    
+    # Query reservations by start_day/end_day ordinals instead of the date strings.
+    # Enable once `python -m app.scripts.migrate_reservation_dates` has backfilled them.
+    RESERVATION_DAY_QUERIES: bool = False
+    
+    # Longest stay a reservation may book, in nights (one room-night lock per night)
+    MAX_STAY_NIGHTS: int = 365
+    
+    # Seconds between refreshes of the dashboard revenue/occupancy rollups (0 disables the task)
+    ROLLUP_REFRESH_INTERVAL_SECONDS: float = 30
+    # How long a refresher may hold a hotel's rollups before another can take them over
+    ROLLUP_LEASE_SECONDS: float = 300
+    # Longest window /dashboard/timeseries serves, in days
+    TIMESERIES_MAX_DAYS: int = 731
+    
+    # Days dashboard activity events are kept (TTL index on activity_events)
+    ACTIVITY_EVENT_TTL_DAYS: int = 90
+    
     # Debug mode
     DEBUG: bool = True
 
@@ -6,6 +6,12 @@ from app.models.hotel import Hotel
 from app.models.room import Room
 from app.models.booking import Reservation
 from app.models.auth import RefreshToken
+from app.models.inventory import HotelInventory
+from app.models.room_night import RoomNight
+from app.models.revision import Revision
+from app.models.stats import Stats
+from app.models.rollup import HotelDayRollup, RollupDirtyRange, RollupLease
+from app.models.activity import ActivityEvent
 
 import logging
 
@@ -34,7 +40,7 @@ async def connect_to_mongo():
     # Initialize Beanie with document models
     await init_beanie(
         database=db.database,
-        document_models=[User, Hotel, Room, Reservation, RefreshToken]
+        document_models=[User, Hotel, Room, Reservation, RefreshToken, HotelInventory, RoomNight, Revision, Stats, HotelDayRollup, RollupDirtyRange, RollupLease, ActivityEvent]
     )
     
     logger.info("Connected to MongoDB and initialized Beanie!")
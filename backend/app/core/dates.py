@@ -0,0 +1,55 @@
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+
+def stay_nights(start_date: str, end_date: str) -> List[date]:
+    """Nights of a stay, from the check-in day up to (not including) the check-out day"""
+    first = date.fromisoformat(start_date)
+    last = date.fromisoformat(end_date)
+    return [first + timedelta(days=offset) for offset in range((last - first).days)]
+
+
+def parse_date(value: str) -> date:
+    """Parse a strict YYYY-MM-DD date (date.fromisoformat also takes 20240101 and 2024-W01-1)"""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_date_range(start_date: str, end_date: str, max_days: int) -> Tuple[date, date]:
+    """Parse a YYYY-MM-DD range whose end is after its start and at most max_days later (ValueError otherwise)"""
+    try:
+        first, last = parse_date(start_date), parse_date(end_date)
+    except ValueError:
+        raise ValueError("Dates must be in YYYY-MM-DD format")
+    if last <= first:
+        raise ValueError("End date must be after start date")
+    if (last - first).days > max_days:
+        raise ValueError(f"Date range cannot exceed {max_days} days")
+    return first, last
+
+
+def stay_length(start_date: str, end_date: str) -> int:
+    """Number of nights between two YYYY-MM-DD dates"""
+    return day_ordinal(end_date) - day_ordinal(start_date)
+
+
+def day_ordinal(value: str) -> int:
+    """Proleptic Gregorian ordinal of a YYYY-MM-DD date, as stored in reservation *_day fields"""
+    return date.fromisoformat(value).toordinal()
+
+
+def time_ago(created_at: datetime) -> str:
+    """Short relative time of a past UTC datetime, such as 3h ago or Just now"""
+    now = datetime.utcnow()
+    diff = now - created_at
+    total_seconds = int(diff.total_seconds())
+    
+    if diff.days > 0:
+        return f"{diff.days}d ago"
+    elif total_seconds > 3600:
+        hours = total_seconds // 3600
+        return f"{hours}h ago"
+    elif total_seconds > 60:
+        minutes = total_seconds // 60
+        return f"{minutes}m ago"
+    else:
+        return "Just now"
@@ -0,0 +1,91 @@
+from functools import lru_cache
+from typing import Callable, FrozenSet, Iterable, Optional, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, create_model
+
+from app.core.config import settings
+
+Fields = FrozenSet[str]
+
+
+def fields_param(response_model: Type[BaseModel]) -> Callable[..., Optional[Fields]]:
+    """
+    Build a dependency decoding ?fields=name,city into the selected field names
+    
+    Unknown names are rejected with 400. "id" is always selected, since
+    cursors and clients key on it. Returns None when no fields are given.
+    """
+    allowed = frozenset(response_model.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated fields to return: {', '.join(sorted(allowed))}"
+        )
+    ) -> Optional[Fields]:
+        if not fields:
+            return None
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = names - allowed
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return frozenset(names | {"id"})
+
+    return dependency
+
+
+def with_fields(fields: Optional[Fields], required: Iterable[str]) -> Optional[Fields]:
+    """Add fields an endpoint needs for its own checks to a sparse selection"""
+    return fields | frozenset(required) if fields is not None else None
+
+
+# Field subsets are chosen by clients, so the cache of generated classes is bounded
+@lru_cache(maxsize=settings.SPARSE_MODEL_CACHE_SIZE)
+def sparse_model(response_model: Type[BaseModel], fields: Fields) -> Type[BaseModel]:
+    """
+    Trimmed copy of a response model holding only the selected fields
+    
+    Field types and defaults are kept; validators are not, as the rows come
+    from documents the full model already validated on write.
+    """
+    return create_model(
+        f"{response_model.__name__}Fields",
+        **{
+            name: (field.annotation, field)
+            for name, field in response_model.model_fields.items()
+            if name in fields
+        }
+    )
+
+
+def expand_param(expandable: Iterable[str]) -> Callable[..., Optional[Fields]]:
+    """Build a dependency decoding ?expand=hotel,room into the links to resolve (400 on unknown names)"""
+    allowed = frozenset(expandable)
+
+    def dependency(
+        expand: Optional[str] = Query(
+            None,
+            description=f"Comma-separated links to embed: {', '.join(sorted(allowed))}"
+        )
+    ) -> Optional[Fields]:
+        if not expand:
+            return None
+        names = {name.strip() for name in expand.split(",") if name.strip()}
+        unknown = names - allowed
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown expand values: {', '.join(sorted(unknown))}")
+        return frozenset(names)
+
+    return dependency
+
+
+def selected_fields(
+    response_model: Type[BaseModel],
+    fields: Optional[Fields],
+    expand: Optional[Fields]
+) -> Optional[Fields]:
+    """Fields a response returns: the sparse selection (or every field when expanding) plus the expanded links"""
+    if not expand:
+        return fields
+    return (fields if fields is not None else frozenset(response_model.model_fields)) | expand
@@ -0,0 +1,92 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Dict, Generic, List, Optional, Type
+
+from beanie import Document
+from bson import ObjectId
+
+from app.core.read_models import ResponseT, find_responses_by_ids
+
+# Per-request memo of load futures, keyed by (collection, id); None outside a request
+_request_memo: ContextVar[Optional[Dict[tuple, asyncio.Future]]] = ContextVar("request_memo", default=None)
+
+
+class BatchLoader(Generic[ResponseT]):
+    """
+    DataLoader-style reads of one collection by id
+    
+    Every load() issued during the same event-loop tick, from any request,
+    is coalesced into one {"_id": {"$in": [...]}} query projected to the
+    response model. Within a request, results are memoized, so repeated
+    lookups of an id (service call, then authorization check) cost nothing.
+    Writes must call clear(id) so the same request re-reads the document.
+    Outside a request (scripts, startup) loads are batched but not memoized.
+    """
+
+    def __init__(self, document: Type[Document], response_model: Type[ResponseT]):
+        self.document = document
+        self.response_model = response_model
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._scheduled = False
+
+    async def load(self, object_id: str) -> Optional[ResponseT]:
+        if not ObjectId.is_valid(object_id):
+            return None
+
+        memo = _request_memo.get()
+        key = (self.response_model, object_id)
+        if memo is not None and key in memo:
+            return await asyncio.shield(memo[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(object_id, []).append(future)
+        if memo is not None:
+            memo[key] = future
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    def clear(self, object_id: str) -> None:
+        """Forget the current request's memoized result for an id (call after writing it)"""
+        memo = _request_memo.get()
+        if memo is not None:
+            memo.pop((self.response_model, object_id), None)
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        self._scheduled = False
+        asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        try:
+            rows, _ = await find_responses_by_ids(self.document, self.response_model, list(batch))
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        found = {row.id: row for row in rows}
+        for object_id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(object_id.lower()))
+
+
+class RequestScopeMiddleware:
+    """Pure ASGI middleware giving each HTTP request its own loader memo"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_memo.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_memo.reset(token)
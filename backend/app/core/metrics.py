@@ -0,0 +1,41 @@
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+
+
+class LatencyTracker:
+    """Rolling window of per-stage durations with p50/p99 summaries"""
+
+    def __init__(self, window: int = 2000):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, stage: str, seconds: float) -> None:
+        self._samples[stage].append(seconds * 1000)
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Milliseconds per stage over the current window"""
+        result = {}
+        for stage, samples in self._samples.items():
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            result[stage] = {
+                "count": len(ordered),
+                "p50_ms": round(ordered[int(0.50 * (len(ordered) - 1))], 3),
+                "p99_ms": round(ordered[int(0.99 * (len(ordered) - 1))], 3),
+                "max_ms": round(ordered[-1], 3)
+            }
+        return result
+
+
+# Stages of ReservationService.create_reservation
+booking_latency = LatencyTracker()
@@ -0,0 +1,50 @@
+import base64
+import binascii
+from typing import Optional, Sequence
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Query, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(object_id) -> str:
+    """Opaque cursor pointing just past the given _id"""
+    return base64.urlsafe_b64encode(ObjectId(str(object_id)).binary).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    try:
+        return ObjectId(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, InvalidId, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def cursor_param(
+    cursor: Optional[str] = Query(
+        None,
+        description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page (skip is ignored when set)"
+    )
+) -> Optional[ObjectId]:
+    """Dependency decoding the optional ?cursor= query parameter"""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    """Advertise the cursor of the next page when this page is full"""
+    if items and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
+
+
+def set_total_count(response: Response, items: Sequence) -> None:
+    """Advertise the total number of matching items when the page carries one (include_total)"""
+    total = getattr(items, "total", None)
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
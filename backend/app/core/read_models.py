@@ -0,0 +1,279 @@
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+from weakref import WeakKeyDictionary
+
+from beanie import Document
+from bson import ObjectId, json_util
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.fields import Fields, sparse_model
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+# Weak keys, so sparse models evicted from their cache are not kept alive here
+_projections: "WeakKeyDictionary[Type[BaseModel], Dict[str, int]]" = WeakKeyDictionary()
+
+# Total matching documents per (collection, filter), kept briefly
+count_cache = LRUCache(settings.COUNT_CACHE_SIZE, settings.COUNT_CACHE_TTL_SECONDS)
+
+
+class Page(list):
+    """A page of response rows that also carries the total number of matching documents"""
+
+    def __init__(self, rows: List[Any], total: int):
+        super().__init__(rows)
+        self.total = total
+
+
+def response_projection(response_model: Type[BaseModel]) -> Dict[str, int]:
+    """Mongo projection of the fields a response model exposes (_id is always returned)"""
+    projection = _projections.get(response_model)
+    if projection is None:
+        # An empty projection would return whole documents, so an id-only model asks for _id
+        projection = _projections[response_model] = {
+            name: 1 for name in response_model.model_fields if name != "id"
+        } or {"_id": 1}
+    return projection
+
+
+def to_response(response_model: Type[ResponseT], doc: Dict[str, Any]) -> ResponseT:
+    """Validate a raw projected document straight into the response model"""
+    doc["id"] = str(doc.pop("_id"))
+    return response_model.model_validate(doc)
+
+
+async def find_one_response(
+    document: Type[Document],
+    response_model: Type[ResponseT],
+    object_id: str,
+    fields: Optional[Fields] = None
+) -> Optional[ResponseT]:
+    """
+    Read one document by id projected to the response shape, or None if the id is invalid or unknown
+    
+    With fields, only those are read and the row comes back as the trimmed
+    sparse_model(response_model, fields).
+    """
+    if not ObjectId.is_valid(object_id):
+        return None
+    if fields is not None:
+        response_model = sparse_model(response_model, fields)
+    doc = await document.get_motor_collection().find_one(
+        {"_id": ObjectId(object_id)}, response_projection(response_model)
+    )
+    return to_response(response_model, doc) if doc else None
+
+
+async def find_responses(
+    document: Type[Document],
+    response_model: Type[ResponseT],
+    query: Dict[str, Any],
+    skip: int = 0,
+    limit: int = 0,
+    after_id: Optional[ObjectId] = None,
+    fields: Optional[Fields] = None,
+    include_total: bool = False
+) -> List[ResponseT]:
+    """
+    Read a page of documents projected to the response shape, in _id order
+    
+    Rows go from the Motor cursor into the response model with a single
+    validation, without building Beanie documents first. With after_id the
+    page seeks straight past it on the _id index (keyset pagination), so
+    deep pages cost the same as the first one; otherwise skip/limit is used.
+    limit=0 means no limit. With fields, rows are read and returned as
+    sparse_model(response_model, fields).
+    
+    With include_total a Page is returned, whose total counts every document
+    matching query (ignoring skip/limit/after_id); see find_page_with_total.
+    """
+    if fields is not None:
+        response_model = sparse_model(response_model, fields)
+    if after_id is not None:
+        skip = 0
+    if include_total:
+        return await find_page_with_total(document, response_model, query, skip, limit, after_id)
+
+    page_query = {**query, "_id": {"$gt": after_id}} if after_id is not None else query
+    cursor = document.get_motor_collection().find(
+        page_query, response_projection(response_model)
+    ).sort("_id", ASCENDING).skip(skip).limit(limit)
+
+    return [to_response(response_model, doc) async for doc in cursor]
+
+
+def _count_key(document: Type[Document], query: Dict[str, Any]) -> Tuple[str, str]:
+    return document.get_collection_name(), json_util.dumps(query, sort_keys=True)
+
+
+async def _known_total(document: Type[Document], query: Dict[str, Any]) -> Optional[int]:
+    """Total that needs no scan: collection metadata when unfiltered, else a cached count (or None)"""
+    if not query:
+        return await document.get_motor_collection().estimated_document_count()
+    return count_cache.get(_count_key(document, query))
+
+
+async def count_total(document: Type[Document], query: Dict[str, Any]) -> int:
+    """Number of documents matching query, from metadata or the count cache when possible"""
+    total = await _known_total(document, query)
+    if total is None:
+        total = await document.get_motor_collection().count_documents(query)
+        count_cache.set(_count_key(document, query), total)
+    return total
+
+
+async def find_page_with_total(
+    document: Type[Document],
+    response_model: Type[ResponseT],
+    query: Dict[str, Any],
+    skip: int = 0,
+    limit: int = 0,
+    after_id: Optional[ObjectId] = None
+) -> Page:
+    """
+    Read a page and the total number of documents matching query
+    
+    - Unfiltered: the page query plus estimated_document_count (metadata, no scan)
+    - Filtered with a cached count: the page query alone
+    - Otherwise one aggregation: $match, then a $facet producing the page
+      and the $count together. Only the rows branch sorts, pages and
+      projects, so the count branch just counts the matches; the count
+      is cached for COUNT_CACHE_TTL_SECONDS so paging on costs no rescans
+    """
+    total = await _known_total(document, query)
+    if total is not None:
+        rows = await find_responses(document, response_model, query, skip=skip, limit=limit, after_id=after_id)
+        return Page(rows, total)
+
+    page_stages: List[Dict[str, Any]] = []
+    if after_id is not None:
+        page_stages.append({"$match": {"_id": {"$gt": after_id}}})
+    page_stages.append({"$sort": {"_id": ASCENDING}})
+    if skip:
+        page_stages.append({"$skip": skip})
+    if limit:
+        page_stages.append({"$limit": limit})
+    page_stages.append({"$project": response_projection(response_model)})
+
+    pipeline = [
+        {"$match": query},
+        {"$facet": {"rows": page_stages, "total": [{"$count": "total"}]}}
+    ]
+    result = (await document.get_motor_collection().aggregate(pipeline).to_list(1))[0]
+    total = result["total"][0]["total"] if result["total"] else 0
+    count_cache.set(_count_key(document, query), total)
+    return Page([to_response(response_model, doc) for doc in result["rows"]], total)
+
+
+async def find_revision(document: Type[Document], object_id: str) -> Optional[int]:
+    """Read only a document's revision counter, or None if the id is invalid or unknown"""
+    if not ObjectId.is_valid(object_id):
+        return None
+    doc = await document.get_motor_collection().find_one({"_id": ObjectId(object_id)}, {"revision": 1})
+    return doc.get("revision", 0) if doc else None
+
+
+# Link name -> (field holding the target's id string, target document, target response model)
+Lookups = Dict[str, Tuple[str, Type[Document], Type[BaseModel]]]
+
+
+def lookup_stages(name: str, id_field: str, target: Type[Document], target_model: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    $lookup embedding the document whose _id is the id string in id_field, as `name`
+    
+    The target is projected to its response model's fields with a string id,
+    so nothing outside the response model (such as a password hash) is read.
+    Ids that are not valid ObjectIds resolve to null.
+    """
+    return [
+        {
+            "$lookup": {
+                "from": target.get_collection_name(),
+                "let": {
+                    "ref": {"$convert": {"input": f"${id_field}", "to": "objectId", "onError": None, "onNull": None}}
+                },
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$ref"]}}},
+                    {"$project": {"_id": 0, "id": {"$toString": "$_id"}, **response_projection(target_model)}}
+                ],
+                "as": name
+            }
+        },
+        {"$unwind": {"path": f"${name}", "preserveNullAndEmptyArrays": True}}
+    ]
+
+
+async def find_expanded_responses(
+    document: Type[Document],
+    response_model: Type[ResponseT],
+    query: Dict[str, Any],
+    lookups: Lookups,
+    skip: int = 0,
+    limit: int = 0,
+    after_id: Optional[ObjectId] = None,
+    fields: Optional[Fields] = None,
+    include_total: bool = False
+) -> List[ResponseT]:
+    """
+    Like find_responses, with linked documents embedded in the same aggregation
+    
+    The page is cut first ($match, $sort, $skip/$limit on _id), then each
+    entry of lookups is resolved with one $lookup on the target's _id index,
+    so expanding costs one round trip whatever the page size. response_model
+    declares the embedded fields; with fields, the rows come back as
+    sparse_model(response_model, fields) and fields must name the lookups.
+    With include_total a Page is returned, counted through count_total.
+    """
+    total = await count_total(document, query) if include_total else None
+    if after_id is not None:
+        query = {**query, "_id": {"$gt": after_id}}
+        skip = 0
+    if fields is not None:
+        response_model = sparse_model(response_model, fields)
+
+    pipeline: List[Dict[str, Any]] = [{"$match": query}, {"$sort": {"_id": ASCENDING}}]
+    if skip:
+        pipeline.append({"$skip": skip})
+    if limit:
+        pipeline.append({"$limit": limit})
+    pipeline.append({"$project": {
+        name: 1 for name in response_projection(response_model) if name not in lookups
+    }})
+    for name, (id_field, target, target_model) in lookups.items():
+        pipeline.extend(lookup_stages(name, id_field, target, target_model))
+
+    docs = await document.get_motor_collection().aggregate(pipeline).to_list(None)
+    rows = [to_response(response_model, doc) for doc in docs]
+    return Page(rows, total) if include_total else rows
+
+
+async def find_responses_by_ids(
+    document: Type[Document],
+    response_model: Type[ResponseT],
+    ids: List[str],
+    query: Optional[Dict[str, Any]] = None
+) -> Tuple[List[ResponseT], List[str]]:
+    """
+    Read many documents by id with a single $in query
+    
+    Returns the found rows in the order of ids (duplicates collapsed) and
+    the ids that are invalid, unknown or filtered out by query.
+    """
+    ordered = list(dict.fromkeys(ids))
+    object_ids = [ObjectId(object_id) for object_id in ordered if ObjectId.is_valid(object_id)]
+    found: Dict[str, ResponseT] = {}
+    if object_ids:
+        id_filter = {"_id": {"$in": object_ids}}
+        cursor = document.get_motor_collection().find(
+            {"$and": [query, id_filter]} if query else id_filter, response_projection(response_model)
+        )
+        async for doc in cursor:
+            row = to_response(response_model, doc)
+            found[row.id] = row
+    # ObjectId strings round-trip in lowercase hex
+    return (
+        [found[object_id.lower()] for object_id in ordered if object_id.lower() in found],
+        [object_id for object_id in ordered if object_id.lower() not in found]
+    )
@@ -0,0 +1,109 @@
+from typing import Any, Awaitable, Callable, Optional, Sequence, Tuple, Union
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.fields import Fields, with_fields
+
+ETAG_HEADER = "ETag"
+
+# (ETag, serialized JSON body) of full hotel and room detail responses
+serialized_cache = LRUCache(settings.SERIALIZED_CACHE_SIZE, settings.SERIALIZED_CACHE_TTL_SECONDS)
+
+
+def json_bytes(model: BaseModel) -> bytes:
+    """Serialize a response model to JSON bytes with pydantic's Rust serializer"""
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def versioned_etag(key: Tuple, revision: int) -> str:
+    """Strong ETag for a resource or list scope at a given revision, e.g. "hotel-<id>-3" (quotes included)"""
+    return '"' + "-".join(str(part) for part in (*key, revision)) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value lists the given ETag (or is *)"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={ETAG_HEADER: etag})
+
+
+async def cached_json_response(
+    key: Tuple,
+    load: Callable[[Optional[Fields]], Awaitable[Optional[BaseModel]]],
+    load_revision: Callable[[], Awaitable[Optional[int]]],
+    if_none_match: Optional[str] = None,
+    fields: Optional[Fields] = None
+) -> Optional[Response]:
+    """
+    Serve a detail response with a revision ETag, from cached bytes when possible
+    
+    - A cached full body whose ETag matches If-None-Match answers 304 with no query at all
+    - Otherwise a conditional request first reads only the revision
+      (load_revision) and answers 304 when it still matches
+    - Only then load(fields) fetches the model, which is serialized once;
+      full bodies are kept in serialized_cache
+    
+    Returns None when nothing is found. Writes must bump the document's
+    revision and call serialized_cache.pop(key) for the object they change.
+    """
+    cached = serialized_cache.get(key) if fields is None else None
+    if cached is not None:
+        etag, payload = cached
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    else:
+        if if_none_match:
+            revision = await load_revision()
+            if revision is not None and etag_matches(if_none_match, versioned_etag(key, revision)):
+                return not_modified(versioned_etag(key, revision))
+
+        model = await load(with_fields(fields, ["revision"]))
+        if model is None:
+            return None
+        etag = versioned_etag(key, model.revision)
+        if fields is None:
+            payload = json_bytes(model)
+            serialized_cache.set(key, (etag, payload))
+        else:
+            payload = model.__pydantic_serializer__.to_json(model, include=fields)
+    return Response(content=payload, media_type="application/json", headers={ETAG_HEADER: etag})
+
+
+def fields_response(
+    content: Union[BaseModel, Sequence[BaseModel]],
+    fields: Optional[Fields],
+    response: Optional[Response] = None
+) -> Any:
+    """
+    Return sparse-fieldset content as JSON bytes, or the content unchanged
+    
+    Trimmed models don't match the endpoint's response_model, so with fields
+    the body is serialized here (limited to the requested fields, dropping
+    any extra ones read for access checks) and response_model validation is
+    skipped. Headers already set on the injected response are carried over.
+    Without fields the content goes through the usual response_model path.
+    """
+    if fields is None:
+        return content
+    if isinstance(content, BaseModel):
+        payload = content.__pydantic_serializer__.to_json(content, include=fields)
+    else:
+        payload = b"[" + b",".join(
+            item.__pydantic_serializer__.to_json(item, include=fields) for item in content
+        ) + b"]"
+    sparse = Response(content=payload, media_type="application/json")
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                sparse.headers[name] = value
+    return sparse
@@ -0,0 +1,30 @@
+from beanie import Document
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from typing import List
+from datetime import datetime
+from app.core.config import settings
+
+
+class ActivityEvent(Document):
+    """
+    One entry of the dashboards' recent activity feed, written by the services
+    
+    scopes says whose feed shows it: "global", "admin:{creator_id}" (hotels
+    and bookings of a hotel admin's hotels) and "hotel:{hotel_id}" (users
+    registering for a hotel). Events expire after ACTIVITY_EVENT_TTL_DAYS.
+    """
+    type: str  # user_registration, hotel_added or booking_created
+    title: str
+    description: str
+    icon: str
+    scopes: List[str]
+    created_at: datetime
+
+    class Settings:
+        name = "activity_events"
+        indexes = [
+            # Newest events of a feed: one index walk per scope
+            IndexModel([("scopes", ASCENDING), ("created_at", DESCENDING)]),
+            # Changing the TTL of an existing collection needs a collMod
+            IndexModel([("created_at", ASCENDING)], expireAfterSeconds=settings.ACTIVITY_EVENT_TTL_DAYS * 86400)
+        ]
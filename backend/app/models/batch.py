@@ -0,0 +1,24 @@
+from pydantic import BaseModel, field_validator
+from typing import Generic, List, TypeVar
+
+MAX_BATCH_IDS = 100
+
+ItemT = TypeVar("ItemT")
+
+
+class BatchRequest(BaseModel):
+    ids: List[str]
+
+    @field_validator('ids')
+    @classmethod
+    def validate_ids(cls, v):
+        if not v:
+            raise ValueError('At least one id is required')
+        if len(v) > MAX_BATCH_IDS:
+            raise ValueError(f'At most {MAX_BATCH_IDS} ids can be requested at once')
+        return v
+
+
+class BatchResponse(BaseModel, Generic[ItemT]):
+    items: List[ItemT]  # In request order, duplicates collapsed
+    missing: List[str]  # Ids that are invalid, unknown or not visible to the caller
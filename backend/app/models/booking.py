@@ -1,11 +1,14 @@
 from beanie import Document, Link
-from pydantic import BaseModel, field_validator
-from typing import Optional, Union
+from pydantic import BaseModel, field_validator, model_validator
+from pymongo import IndexModel, ASCENDING
+from typing import List, Optional, Union
 from datetime import datetime, date
 from enum import Enum
-from app.models.user import User
-from app.models.hotel import Hotel
-from app.models.room import Room
+from app.models.user import User, UserResponse
+from app.models.hotel import Hotel, HotelResponse
+from app.models.room import Room, RoomResponse
+from app.core.config import settings
+from app.core.dates import day_ordinal, stay_length
 
 
 class ReservationType(str, Enum):
@@ -22,6 +25,10 @@ class ReservationStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Reservations in these states hold their room for the booked dates
+ACTIVE_RESERVATION_STATUSES = [ReservationStatus.CONFIRMED.value, ReservationStatus.CHECKED_IN.value]
+
+
 class ReservationBase(BaseModel):
     hotel_id: str
     room_id: str
@@ -60,7 +67,11 @@ class ReservationBase(BaseModel):
 
 
 class ReservationCreate(ReservationBase):
-    pass
+    @model_validator(mode='after')
+    def validate_stay_length(self):
+        if stay_length(self.start_date, self.end_date) > settings.MAX_STAY_NIGHTS:
+            raise ValueError(f'A stay cannot exceed {settings.MAX_STAY_NIGHTS} nights')
+        return self
 
 
 class ReservationUpdate(BaseModel):
@@ -91,12 +102,31 @@ class Reservation(Document):
     type: ReservationType
     status: ReservationStatus = ReservationStatus.PENDING
     total_price: float
+    # Day ordinals of start_date/end_date, used by the conflict and availability queries
+    start_day: Optional[int] = None
+    end_day: Optional[int] = None
+    # Whether the stay's nights are counted in the hotel inventory ledger (see rebuild_inventory)
+    holds_capacity: bool = False
     hotel: Link[Hotel]
     room: Link[Room]
     visitor: Link[User]
     created_at: datetime = datetime.now()
     updated_at: datetime = datetime.now()
 
+    @model_validator(mode='before')
+    @classmethod
+    def fill_day_ordinals(cls, data):
+        if isinstance(data, dict):
+            data = dict(data)
+            for date_field, day_field in (("start_date", "start_day"), ("end_date", "end_day")):
+                value = data.get(date_field)
+                if isinstance(value, str) and data.get(day_field) is None:
+                    try:
+                        data[day_field] = day_ordinal(value)
+                    except ValueError:
+                        pass  # Reported by validate_date_format
+        return data
+
     @field_validator('start_date', 'end_date')
     @classmethod
     def validate_date_format(cls, v):
@@ -130,8 +160,12 @@ class Reservation(Document):
             "room_id",
             "visitor_id",
             "status",
-            "start_date",
-            "end_date"
+            # Keyset pagination within a hotel's / visitor's reservations
+            IndexModel([("hotel_id", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("visitor_id", ASCENDING), ("_id", ASCENDING)]),
+            # Equality on room/hotel and status first, then the date range bounds
+            IndexModel([("room_id", ASCENDING), ("status", ASCENDING), ("start_day", ASCENDING), ("end_day", ASCENDING)]),
+            IndexModel([("hotel_id", ASCENDING), ("status", ASCENDING), ("start_day", ASCENDING), ("end_day", ASCENDING)])
         ]
 
 
@@ -139,3 +173,37 @@ class ReservationResponse(ReservationBase):
     id: str
     created_at: datetime
     updated_at: datetime
+
+
+class ReservationExpandedResponse(ReservationResponse):
+    """Reservation with the links requested through ?expand= embedded"""
+    hotel: Optional[HotelResponse] = None
+    room: Optional[RoomResponse] = None
+    visitor: Optional[UserResponse] = None
+
+
+class BulkReservationRequest(BaseModel):
+    items: List[ReservationCreate]
+    all_or_nothing: bool = False
+
+    @field_validator('items')
+    @classmethod
+    def validate_items(cls, v):
+        if not v:
+            raise ValueError('At least one reservation is required')
+        if len(v) > 100:
+            raise ValueError('At most 100 reservations can be created at once')
+        return v
+
+
+class BulkReservationResult(BaseModel):
+    index: int
+    success: bool
+    reservation: Optional[ReservationResponse] = None
+    error: Optional[str] = None
+
+
+class BulkReservationResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkReservationResult]
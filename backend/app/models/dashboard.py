@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Any, Dict
+
+
+class DashboardStats(BaseModel):
+    total_users: int
+    total_hotels: int
+    total_bookings: int
+    total_revenue: float
+    active_hotels: int
+    pending_bookings: int
+    recent_activity: list[Dict[str, Any]]
+
+
+class HotelAdminDashboardStats(BaseModel):
+    my_hotels: int
+    total_reservations: int
+    recent_activity: list[Dict[str, Any]]
@@ -1,4 +1,5 @@
 from beanie import Document
+from pymongo import IndexModel, ASCENDING
 from pydantic import BaseModel, EmailStr, field_validator, Field, ConfigDict, field_serializer
 from typing import Optional, List, Annotated
 from datetime import datetime, time
@@ -136,6 +137,8 @@ class HotelUpdate(BaseModel):
 
 class Hotel(Document, HotelBase):
     created_at: datetime = datetime.utcnow()
+    updated_at: Optional[datetime] = None
+    revision: int = 0  # Incremented on every update, feeds the ETag
 
     class Settings:
         name = "hotels"
@@ -144,10 +147,13 @@ class Hotel(Document, HotelBase):
             "city",
             "country",
             "is_active",
-            "created_by"
+            "created_by",
+            IndexModel([("is_active", ASCENDING), ("_id", ASCENDING)])  # Keyset pagination of active hotels
         ]
 
 
 class HotelResponse(HotelBase):
     id: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
+    revision: int = 0
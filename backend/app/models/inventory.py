@@ -0,0 +1,30 @@
+from beanie import Document
+from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING
+from typing import List
+
+
+class HotelInventory(Document):
+    """
+    Room-night ledger for one hotel and calendar month
+    
+    nights[d - 1] holds the number of active reservations covering the
+    night of day d. Reservation writes adjust it atomically with $inc.
+    """
+    hotel_id: str
+    month: str  # YYYY-MM
+    nights: List[int]
+
+    class Settings:
+        name = "hotel_inventory"
+        indexes = [
+            IndexModel([("hotel_id", ASCENDING), ("month", ASCENDING)], unique=True)
+        ]
+
+
+class HotelCapacityResponse(BaseModel):
+    hotel_id: str
+    start_date: str
+    end_date: str
+    max_reservations_capacity: int
+    remaining_capacity: int
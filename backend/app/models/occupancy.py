@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class RoomOccupancy(BaseModel):
+    room_id: str
+    room_number: str
+    # Bit d-1 is set when the night of day d is booked
+    mask: int
+    # Booked stretches as [first_day, nights], days 1-based
+    runs: List[List[int]]
+
+
+class OccupancyCalendar(BaseModel):
+    hotel_id: str
+    month: str
+    days_in_month: int
+    rooms: List[RoomOccupancy]
+    # Booked rooms per night, index 0 is day 1
+    occupied_per_day: List[int]
@@ -0,0 +1,19 @@
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+
+
+class Revision(Document):
+    """
+    Change counter for a collection scope, bumped with $inc on every write
+    
+    Scopes: "hotels" for the hotel list, "rooms:{hotel_id}" for a hotel's rooms.
+    List ETags are derived from it, so a poll costs one indexed lookup.
+    """
+    scope: str
+    revision: int = 0
+
+    class Settings:
+        name = "revisions"
+        indexes = [
+            IndexModel([("scope", ASCENDING)], unique=True)
+        ]
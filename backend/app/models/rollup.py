@@ -0,0 +1,83 @@
+from beanie import Document
+from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING
+from typing import List, Optional
+from datetime import datetime
+from enum import Enum
+
+
+class HotelDayRollup(Document):
+    """
+    Revenue and occupied room-nights of one hotel for one night
+    
+    Written by RollupService from the reservations staying that night;
+    a reservation's total_price is spread evenly over its nights.
+    """
+    hotel_id: str
+    day: str  # YYYY-MM-DD
+    revenue: float = 0
+    room_nights: int = 0
+    updated_at: Optional[datetime] = None
+
+    class Settings:
+        name = "hotel_day_rollups"
+        indexes = [
+            IndexModel([("hotel_id", ASCENDING), ("day", ASCENDING)], unique=True),
+            "day"  # Windows across all hotels
+        ]
+
+
+class RollupDirtyRange(Document):
+    """
+    Nights of a hotel whose rollups are stale, from start_date up to (not including) end_date
+    
+    Each reservation write inserts its own range. The refresher holding the
+    hotel's lease merges the ranges that overlap or touch, recomputes those
+    days and deletes exactly the ranges it read.
+    """
+    hotel_id: str
+    start_date: str
+    end_date: str
+
+    class Settings:
+        name = "rollup_dirty_ranges"
+        indexes = [
+            IndexModel([("hotel_id", ASCENDING), ("start_date", ASCENDING)])
+        ]
+
+
+class RollupLease(Document):
+    """
+    Exclusive right of one refresher to recompute a hotel's rollups until expires_at
+    
+    Keeps two refreshers (the API task and rebuild_rollups, or several API
+    workers) from writing rollups of the same hotel from different snapshots.
+    """
+    hotel_id: str
+    owner: str
+    expires_at: datetime
+
+    class Settings:
+        name = "rollup_leases"
+        indexes = [
+            IndexModel([("hotel_id", ASCENDING)], unique=True)
+        ]
+
+
+class TimeseriesGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class TimeseriesPoint(BaseModel):
+    period_start: str  # First day of the period (weeks start on Monday)
+    revenue: float
+    room_nights: int
+
+
+class TimeseriesResponse(BaseModel):
+    granularity: TimeseriesGranularity
+    start_date: str
+    end_date: str
+    points: List[TimeseriesPoint]
@@ -1,4 +1,5 @@
 from beanie import Document
+from pymongo import IndexModel, ASCENDING
 from pydantic import BaseModel, field_validator
 from typing import Optional
 from datetime import datetime
@@ -51,6 +52,8 @@ class RoomUpdate(BaseModel):
 
 class Room(Document, RoomBase):
     created_at: datetime = datetime.utcnow()
+    updated_at: Optional[datetime] = None
+    revision: int = 0  # Incremented on every update, feeds the ETag
 
     class Settings:
         name = "rooms"
@@ -59,10 +62,13 @@ class Room(Document, RoomBase):
             "room_number", 
             "type",
             "is_available",
-            ("hotel_id", "room_number")  # Compound unique index
+            ("hotel_id", "room_number"),  # Compound unique index
+            IndexModel([("is_available", ASCENDING), ("_id", ASCENDING)])  # Keyset pagination of available rooms
         ]
 
 
 class RoomResponse(RoomBase):
     id: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
+    revision: int = 0
@@ -0,0 +1,22 @@
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+
+
+class RoomNight(Document):
+    """
+    Lock on one night of one room
+    
+    The unique (room_id, date) index makes claiming a night an atomic
+    insert: of two concurrent bookings for the same night, exactly one
+    insert succeeds.
+    """
+    room_id: str
+    date: str  # YYYY-MM-DD of the night (check-in day of that night)
+    reservation_id: str
+
+    class Settings:
+        name = "room_nights"
+        indexes = [
+            IndexModel([("room_id", ASCENDING), ("date", ASCENDING)], unique=True),
+            "reservation_id"
+        ]
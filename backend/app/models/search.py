@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class HotelAvailability(BaseModel):
+    hotel_id: str
+    name: str
+    city: str
+    country: str
+    available_rooms: int
+    cheapest_price: float
+
+
+class AvailabilitySearchResponse(BaseModel):
+    items: List[HotelAvailability]
+    total: int
+    skip: int
+    limit: int
@@ -0,0 +1,28 @@
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from typing import Dict, Optional
+from datetime import datetime
+
+
+class Stats(Document):
+    """
+    Dashboard counters for one scope, maintained with $inc by the services
+    
+    Scopes: "global", "hotel:{hotel_id}" (users and reservations of a hotel)
+    and "admin:{creator_id}" (hotels a hotel admin created and their
+    reservations). Rebuild with `python -m app.scripts.reconcile_stats`.
+    """
+    scope: str
+    users: int = 0
+    hotels: int = 0
+    active_hotels: int = 0
+    reservations: int = 0
+    by_status: Dict[str, int] = {}  # Reservations per status
+    revenue: float = 0
+    updated_at: Optional[datetime] = None
+
+    class Settings:
+        name = "stats"
+        indexes = [
+            IndexModel([("scope", ASCENDING)], unique=True)
+        ]
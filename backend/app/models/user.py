@@ -1,4 +1,5 @@
 from beanie import Document, Link
+from pymongo import IndexModel, ASCENDING
 from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 from datetime import datetime
@@ -70,7 +71,8 @@ class User(Document, UserBase):
             "email",
             "role",
             "hotel_id",
-            "is_active"
+            "is_active",
+            IndexModel([("hotel_id", ASCENDING), ("_id", ASCENDING)])  # Keyset pagination within a hotel
         ]
 
 
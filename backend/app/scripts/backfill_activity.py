@@ -0,0 +1,69 @@
+"""
+Seed the dashboard activity feed from existing users, hotels and reservations
+
+The feed only receives events for writes made after it was deployed; this
+adds events for the newest documents of each collection created within
+ACTIVITY_EVENT_TTL_DAYS, so the dashboards are not empty at first. Run it
+once, on an empty activity_events collection (events already present are
+not deduplicated).
+
+Usage (from the backend directory):
+    python -m app.scripts.backfill_activity [--limit 100]
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.read_models import find_responses_by_ids
+from app.models.activity import ActivityEvent
+from app.models.booking import Reservation
+from app.models.hotel import Hotel, HotelResponse
+from app.models.user import User
+from app.services.activity_service import ActivityService
+
+
+async def newest(document, since: datetime, limit: int, fields: list) -> list:
+    return await document.get_motor_collection().find(
+        {"created_at": {"$gte": since}}, {field: 1 for field in fields}
+    ).sort("created_at", -1).limit(limit).to_list(limit)
+
+
+async def backfill(limit: int) -> None:
+    await connect_to_mongo()
+    try:
+        since = datetime.utcnow() - timedelta(days=settings.ACTIVITY_EVENT_TTL_DAYS)
+        users = await newest(User, since, limit, ["name", "email", "hotel_id", "created_at"])
+        hotels = await newest(Hotel, since, limit, ["name", "city", "created_by", "created_at"])
+        reservations = await newest(Reservation, since, limit, ["hotel_id", "total_price", "created_at"])
+
+        booked_hotels, _ = await find_responses_by_ids(
+            Hotel, HotelResponse, [reservation["hotel_id"] for reservation in reservations]
+        )
+        hotels_by_id = {hotel.id: hotel for hotel in booked_hotels}
+
+        events = [
+            ActivityService.user_registered(user["name"], user["email"], user.get("hotel_id"), user["created_at"])
+            for user in users
+        ] + [
+            ActivityService.hotel_added(hotel["name"], hotel["city"], hotel.get("created_by"), hotel["created_at"])
+            for hotel in hotels
+        ] + [
+            ActivityService.booking_created(
+                reservation["total_price"], hotels_by_id.get(reservation["hotel_id"]), reservation["created_at"]
+            )
+            for reservation in reservations
+        ]
+        if events:
+            await ActivityEvent.get_motor_collection().insert_many(events, ordered=False)
+        print(f"Done: {len(users)} user, {len(hotels)} hotel and {len(reservations)} booking events added")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the dashboard activity feed")
+    parser.add_argument("--limit", type=int, default=100, help="Newest documents to take per collection")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.limit))
@@ -0,0 +1,130 @@
+"""
+Benchmark of concurrent bookings competing for one room
+
+Creates a throwaway hotel, room and visitor, then starts --bookers
+concurrent ReservationService.create_reservation calls for that room and
+reports successes, rejections, latency percentiles and whether any night
+ended up double booked. With --window 1 (the default) every booker asks for
+the same nights, so exactly one must succeed; a larger window spreads
+1-3 night stays over that many days, so several succeed but none may overlap.
+
+Needs a MongoDB (MONGODB_URL); the throwaway documents are deleted through
+the services afterwards (activity events stay until their TTL).
+Usage (from the backend directory):
+    python -m app.scripts.bench_booking_contention [--bookers 300] [--window 1]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.models.booking import Reservation, ReservationCreate, ReservationResponse, ACTIVE_RESERVATION_STATUSES
+from app.models.hotel import HotelCreate
+from app.models.room import RoomCreate
+from app.models.user import UserCreate
+from app.services.booking_service import ReservationService
+from app.services.hotel_service import HotelService
+from app.services.room_service import RoomService
+from app.services.user_service import UserService
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def book(data: ReservationCreate) -> Tuple[Optional[ReservationResponse], float]:
+    started = time.perf_counter()
+    reservation = await ReservationService.create_reservation(data)
+    return reservation, (time.perf_counter() - started) * 1000
+
+
+def stays(bookers: int, window: int) -> List[Tuple[str, str]]:
+    first = date.today() + timedelta(days=30)
+    if window <= 1:
+        return [(first.isoformat(), (first + timedelta(days=2)).isoformat())] * bookers
+    result = []
+    for _ in range(bookers):
+        start = first + timedelta(days=random.randrange(window))
+        result.append((start.isoformat(), (start + timedelta(days=random.randint(1, 3))).isoformat()))
+    return result
+
+
+async def double_booked_nights(room_id: str) -> int:
+    """Nights held by more than one active reservation of the room"""
+    nights = {}
+    cursor = Reservation.get_motor_collection().find(
+        {"room_id": room_id, "status": {"$in": ACTIVE_RESERVATION_STATUSES}}, {"start_date": 1, "end_date": 1}
+    )
+    async for reservation in cursor:
+        night = date.fromisoformat(reservation["start_date"])
+        while night < date.fromisoformat(reservation["end_date"]):
+            nights[night] = nights.get(night, 0) + 1
+            night += timedelta(days=1)
+    return sum(1 for count in nights.values() if count > 1)
+
+
+async def run(bookers: int, window: int) -> None:
+    await connect_to_mongo()
+    tag = uuid4().hex[:8]
+    created: List[ReservationResponse] = []
+    visitor = hotel = room = None
+    try:
+        visitor = await UserService.create_user(UserCreate(
+            name=f"Bench {tag}", email=f"bench-{tag}@example.com", age=30, mobile_number="+20100000000",
+            gender="male", password=uuid4().hex
+        ))
+        hotel = await HotelService.create_hotel(HotelCreate(
+            name=f"Bench {tag}", tax_number=f"BENCH-{tag}", contact_email=f"bench-{tag}@example.com",
+            contact_phone="+20100000000", address="1 Bench Street", city="Cairo", country="Egypt",
+            max_reservations_capacity=bookers
+        ))
+        room = await RoomService.create_room(RoomCreate(
+            room_number="101", hotel_id=hotel.id, price_per_night=100, type="double", max_occupancy=2
+        ))
+
+        requests = [
+            ReservationCreate(
+                hotel_id=hotel.id, room_id=room.id, visitor_id=visitor.id, start_date=start_date,
+                end_date=end_date, type="room_only", status="confirmed", total_price=200
+            )
+            for start_date, end_date in stays(bookers, window)
+        ]
+        started = time.perf_counter()
+        results = await asyncio.gather(*(book(data) for data in requests))
+        elapsed = time.perf_counter() - started
+
+        created = [reservation for reservation, _ in results if reservation]
+        latencies = [latency for _, latency in results]
+        print(f"{bookers} concurrent bookers on one room, window of {window} day(s), {elapsed:.2f} s in total")
+        print(f"  succeeded  {len(created)}")
+        print(f"  rejected   {bookers - len(created)}")
+        print(f"  latency    p50 {percentile(latencies, 0.5):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms, "
+              f"max {max(latencies):.1f} ms")
+        print(f"  double booked nights: {await double_booked_nights(room.id)}")
+    finally:
+        for reservation in created:
+            await ReservationService.delete_reservation(reservation.id)
+        if room:
+            await RoomService.delete_room(room.id)
+        if hotel:
+            await HotelService.delete_hotel(hotel.id)
+        if visitor:
+            await UserService.delete_user(visitor.id)
+        await close_mongo_connection()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookers", type=int, default=300)
+    parser.add_argument("--window", type=int, default=1, help="Days the stays are spread over (1: all the same)")
+    args = parser.parse_args()
+    asyncio.run(run(args.bookers, args.window))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Microbenchmark of response encoding cost per 1k rows
+
+Compares, for List[HotelResponse] and List[ReservationResponse]:
+    json      - FastAPI's serialize step followed by json.dumps (JSONResponse)
+    orjson    - the same serialize step followed by orjson.dumps (ORJSONResponse)
+    cached    - joining bytes already serialized per object (cached detail bodies)
+
+Needs no database. Usage (from the backend directory):
+    python -m app.scripts.bench_json_encoding [--rows 1000] [--repeat 50]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable, List
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.core.responses import json_bytes
+from app.models.booking import ReservationResponse
+from app.models.hotel import HotelResponse
+
+
+def make_hotels(rows: int) -> List[HotelResponse]:
+    return [
+        HotelResponse(
+            id=f"{index:024x}",
+            name=f"Hotel {index}",
+            tax_number=f"TAX-{index}",
+            contact_email=f"hotel{index}@example.com",
+            contact_phone="+20100000000",
+            address=f"{index} Nile Street",
+            city="Cairo",
+            country="Egypt",
+            gallery=[f"https://cdn.example.com/hotels/{index}/{photo}.jpg" for photo in range(3)],
+            max_reservations_capacity=100,
+            created_by=f"{index % 50:024x}",
+            created_at=datetime(2024, 1, 1, 12, 0, 0)
+        )
+        for index in range(rows)
+    ]
+
+
+def make_reservations(rows: int) -> List[ReservationResponse]:
+    return [
+        ReservationResponse(
+            id=f"{index:024x}",
+            hotel_id=f"{index % 20:024x}",
+            room_id=f"{index % 400:024x}",
+            visitor_id=f"{index % 300:024x}",
+            start_date="2024-06-01",
+            end_date="2024-06-05",
+            type="room_only",
+            status="confirmed",
+            total_price=480.0,
+            created_at=datetime(2024, 5, 1, 9, 30, 0),
+            updated_at=datetime(2024, 5, 1, 9, 30, 0)
+        )
+        for index in range(rows)
+    ]
+
+
+def timed(encode: Callable[[], bytes], repeat: int) -> float:
+    """Best wall time of one encode() call, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def bench(label: str, items: list, repeat: int) -> None:
+    adapter = TypeAdapter(List[type(items[0])])
+    cached = [json_bytes(item) for item in items]
+
+    results = {
+        "json": timed(lambda: json.dumps(adapter.dump_python(items, mode="json")).encode(), repeat),
+        "orjson": timed(lambda: orjson.dumps(adapter.dump_python(items, mode="json")), repeat),
+        "cached": timed(lambda: b"[" + b",".join(cached) + b"]", repeat)
+    }
+    per_1k = 1000 / len(items)
+    print(f"{label} ({len(items)} rows)")
+    for name, elapsed in results.items():
+        print(f"  {name:<7} {elapsed * per_1k:8.2f} ms / 1k rows")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    bench("HotelResponse", make_hotels(args.rows), args.repeat)
+    bench("ReservationResponse", make_reservations(args.rows), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
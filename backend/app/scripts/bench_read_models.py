@@ -0,0 +1,130 @@
+"""
+Benchmark of list reads: Beanie Document hydration vs projected read models
+
+For hotels, rooms and reservations, seeds --rows documents under a unique
+tag and reads them back twice, reporting rows/sec:
+    documents  - Document.find().to_list(), then model_dump() and
+                 model_validate() into the response model (the previous path)
+    projection - find_responses(): raw Motor rows with the response model's
+                 projection, validated once (what get_hotels/get_rooms/
+                 get_reservations use)
+
+Needs a MongoDB (MONGODB_URL); the seeded documents are deleted afterwards.
+Usage (from the backend directory):
+    python -m app.scripts.bench_read_models [--rows 1000 10000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Type
+from uuid import uuid4
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.read_models import find_responses
+from app.models.booking import Reservation, ReservationResponse
+from app.models.hotel import Hotel, HotelResponse
+from app.models.room import Room, RoomResponse
+from app.models.user import User
+
+
+def make_hotels(tag: str, rows: int) -> List[Hotel]:
+    return [
+        Hotel(
+            name=f"Hotel {index}", tax_number=f"TAX-{tag}-{index}", contact_email=f"hotel{index}@example.com",
+            contact_phone="+20100000000", address=f"{index} Nile Street", city="Cairo", country="Egypt",
+            gallery=[f"https://cdn.example.com/hotels/{index}/{photo}.jpg" for photo in range(3)],
+            max_reservations_capacity=100, created_by=tag
+        )
+        for index in range(rows)
+    ]
+
+
+def make_rooms(tag: str, rows: int) -> List[Room]:
+    return [
+        Room(room_number=str(index), hotel_id=tag, price_per_night=100, type="double", max_occupancy=2)
+        for index in range(rows)
+    ]
+
+
+def make_reservations(tag: str, rows: int) -> List[Reservation]:
+    hotel_id, room_id, visitor_id = PydanticObjectId(), PydanticObjectId(), PydanticObjectId()
+    return [
+        Reservation(
+            hotel_id=tag, room_id=str(room_id), visitor_id=str(visitor_id), start_date="2024-06-01",
+            end_date="2024-06-05", type="room_only", status="confirmed", total_price=480.0,
+            hotel=Hotel.link_from_id(hotel_id), room=Room.link_from_id(room_id), visitor=User.link_from_id(visitor_id)
+        )
+        for _ in range(rows)
+    ]
+
+
+async def timed(read: Callable[[], Awaitable[list]], rows: int, repeat: int) -> float:
+    """Best rows/sec over repeat reads, checking each read returns every row"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await read()
+        best = min(best, time.perf_counter() - started)
+        assert len(result) == rows, f"read {len(result)} rows, expected {rows}"
+    return rows / best
+
+
+async def bench(
+    label: str,
+    document: Type[Document],
+    response_model: Type[BaseModel],
+    seed: List[Document],
+    query: dict,
+    repeat: int
+) -> None:
+    rows = len(seed)
+    await document.insert_many(seed)
+    try:
+        async def documents() -> list:
+            return [
+                response_model.model_validate({**doc.model_dump(), "id": str(doc.id)})
+                for doc in await document.find(query).to_list()
+            ]
+
+        async def projection() -> list:
+            return await find_responses(document, response_model, query)
+
+        results = {
+            "documents": await timed(documents, rows, repeat),
+            "projection": await timed(projection, rows, repeat)
+        }
+        print(f"{label} ({rows} rows)")
+        for name, rate in results.items():
+            print(f"  {name:<10} {rate:10.0f} rows/s")
+    finally:
+        await document.get_motor_collection().delete_many(query)
+
+
+async def run(sizes: List[int], repeat: int) -> None:
+    await connect_to_mongo()
+    try:
+        for rows in sizes:
+            tag = f"bench-{uuid4().hex[:8]}"
+            await bench("get_hotels", Hotel, HotelResponse, make_hotels(tag, rows), {"created_by": tag}, repeat)
+            await bench("get_rooms", Room, RoomResponse, make_rooms(tag, rows), {"hotel_id": tag}, repeat)
+            await bench(
+                "get_reservations", Reservation, ReservationResponse, make_reservations(tag, rows),
+                {"hotel_id": tag}, repeat
+            )
+    finally:
+        await close_mongo_connection()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Backfill start_day/end_day on existing reservations
+
+Runs online in batches: each batch is an unordered bulk write of
+conditional $set operations, so it can be re-run safely and never
+overwrites values written by the API in the meantime.
+
+Usage (from the backend directory):
+    python -m app.scripts.migrate_reservation_dates [--batch-size 1000] [--explain]
+
+With --explain, the conflict query for a sample room is explained before
+and after the backfill, once with the date strings and once with the
+day ordinals. Set RESERVATION_DAY_QUERIES=true once this has finished.
+"""
+import argparse
+import asyncio
+
+from pymongo import UpdateOne
+
+from app.core.database import connect_to_mongo, close_mongo_connection, db
+from app.core.dates import day_ordinal
+from app.models.booking import Reservation, ACTIVE_RESERVATION_STATUSES
+
+
+async def explain_conflict_query(sample: dict, use_days: bool) -> None:
+    if use_days:
+        date_filter = {
+            "start_day": {"$lte": day_ordinal(sample["end_date"])},
+            "end_day": {"$gte": day_ordinal(sample["start_date"])}
+        }
+    else:
+        date_filter = {
+            "start_date": {"$lte": sample["end_date"]},
+            "end_date": {"$gte": sample["start_date"]}
+        }
+    query = {"room_id": sample["room_id"], "status": {"$in": ACTIVE_RESERVATION_STATUSES}, **date_filter}
+
+    result = await db.database.command(
+        "explain",
+        {"find": Reservation.get_motor_collection().name, "filter": query},
+        verbosity="executionStats"
+    )
+    stats = result["executionStats"]
+    plan = result["queryPlanner"]["winningPlan"]
+    while "inputStage" in plan:
+        plan = plan["inputStage"]
+    print(
+        f"  {'day ordinals' if use_days else 'date strings'}: "
+        f"{stats['nReturned']} returned, {stats['totalKeysExamined']} keys, "
+        f"{stats['totalDocsExamined']} docs examined in {stats['executionTimeMillis']} ms "
+        f"(index: {plan.get('indexName', plan.get('stage'))})"
+    )
+
+
+async def explain_all(label: str) -> None:
+    sample = await Reservation.get_motor_collection().find_one(
+        {}, {"room_id": 1, "start_date": 1, "end_date": 1}
+    )
+    if not sample:
+        return
+    print(f"Conflict query plan {label}:")
+    await explain_conflict_query(sample, use_days=False)
+    await explain_conflict_query(sample, use_days=True)
+
+
+async def migrate(batch_size: int, explain: bool) -> None:
+    await connect_to_mongo()
+    try:
+        if explain:
+            await explain_all("before backfill")
+
+        collection = Reservation.get_motor_collection()
+        cursor = collection.find(
+            {"$or": [{"start_day": {"$exists": False}}, {"end_day": {"$exists": False}}]},
+            {"start_date": 1, "end_date": 1}
+        ).batch_size(batch_size)
+
+        operations = []
+        migrated = 0
+        async for doc in cursor:
+            operations.append(UpdateOne(
+                {"_id": doc["_id"], "start_date": doc["start_date"], "end_date": doc["end_date"]},
+                {"$set": {
+                    "start_day": day_ordinal(doc["start_date"]),
+                    "end_day": day_ordinal(doc["end_date"])
+                }}
+            ))
+            if len(operations) >= batch_size:
+                result = await collection.bulk_write(operations, ordered=False)
+                migrated += result.modified_count
+                operations = []
+                print(f"Migrated {migrated} reservations...")
+        if operations:
+            result = await collection.bulk_write(operations, ordered=False)
+            migrated += result.modified_count
+
+        print(f"Done: {migrated} reservations migrated")
+
+        if explain:
+            await explain_all("after backfill")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill reservation day ordinals")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--explain", action="store_true", help="Print conflict query plans before and after")
+    args = parser.parse_args()
+    asyncio.run(migrate(args.batch_size, args.explain))
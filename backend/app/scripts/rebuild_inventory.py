@@ -0,0 +1,152 @@
+"""
+Rebuild the hotel inventory ledger and room-night locks from active reservations
+
+Reservations made before the ledger existed were never counted in it (and
+hold no room-night locks), so hotels could take more than their capacity on
+those nights. This recomputes every hotel_inventory month from the active
+reservations, prints the months that drifted, adds the missing room-night
+locks, removes orphaned ones and sets holds_capacity on each reservation to match.
+
+A lock is orphaned when no active reservation holds that night, e.g. after
+a crash between locking the nights and saving the reservation. Locks
+younger than ORPHAN_GRACE are left alone, as their booking may still be in flight.
+
+Usage (from the backend directory):
+    python -m app.scripts.rebuild_inventory [--dry-run]
+
+Run it once after deploying the ledger, with the API stopped: bookings made
+while it runs would be overwritten by the recomputed counts. With --dry-run
+only the drift is reported.
+"""
+import argparse
+import asyncio
+import calendar
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from bson import ObjectId
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.dates import stay_nights
+from app.models.booking import Reservation, ACTIVE_RESERVATION_STATUSES
+from app.models.hotel import Hotel
+from app.models.inventory import HotelInventory
+from app.models.room_night import RoomNight
+from app.services.inventory_service import nights_by_month
+
+ORPHAN_GRACE = timedelta(minutes=10)
+
+
+def empty_month(month: str) -> List[int]:
+    year, month_number = (int(part) for part in month.split("-"))
+    return [0] * calendar.monthrange(year, month_number)[1]
+
+
+async def rebuild(dry_run: bool) -> None:
+    await connect_to_mongo()
+    try:
+        ledger: Dict[Tuple[str, str], List[int]] = {}
+        locks = []
+        cursor = Reservation.get_motor_collection().find(
+            {"status": {"$in": ACTIVE_RESERVATION_STATUSES}},
+            {"hotel_id": 1, "room_id": 1, "start_date": 1, "end_date": 1}
+        )
+        async for reservation in cursor:
+            for month, days in nights_by_month(reservation["start_date"], reservation["end_date"]).items():
+                nights = ledger.setdefault((reservation["hotel_id"], month), empty_month(month))
+                for day in days:
+                    nights[day] += 1
+            locks.extend(
+                {"room_id": reservation["room_id"], "date": night.isoformat(), "reservation_id": str(reservation["_id"])}
+                for night in stay_nights(reservation["start_date"], reservation["end_date"])
+            )
+
+        inventory = HotelInventory.get_motor_collection()
+        stored = {(doc["hotel_id"], doc["month"]): doc["nights"] async for doc in inventory.find({}, {"_id": 0})}
+        operations = []
+        for key in sorted(set(ledger) | set(stored)):
+            nights = ledger.get(key)
+            if nights == stored.get(key):
+                continue
+            print(f"{key[0]} {key[1]}: {stored.get(key)} -> {nights}")
+            if nights is None:
+                operations.append(DeleteOne({"hotel_id": key[0], "month": key[1]}))
+            else:
+                operations.append(ReplaceOne(
+                    {"hotel_id": key[0], "month": key[1]},
+                    {"hotel_id": key[0], "month": key[1], "nights": nights},
+                    upsert=True
+                ))
+        print(f"{len(operations)} of {len(set(ledger) | set(stored))} inventory months drifted")
+
+        expected = {(lock["room_id"], lock["date"], lock["reservation_id"]) for lock in locks}
+        cutoff = ObjectId.from_datetime(datetime.now(timezone.utc) - ORPHAN_GRACE)
+        orphans = [
+            lock["_id"]
+            async for lock in RoomNight.get_motor_collection().find({"_id": {"$lt": cutoff}})
+            if (lock["room_id"], lock["date"], lock["reservation_id"]) not in expected
+        ]
+        print(f"{len(orphans)} room-night locks are not held by an active reservation")
+
+        # Nights already above capacity cannot be fixed here, only reported
+        capacities = {
+            str(hotel["_id"]): hotel.get("max_reservations_capacity")
+            async for hotel in Hotel.get_motor_collection().find({}, {"max_reservations_capacity": 1})
+        }
+        over: Dict[str, int] = defaultdict(int)
+        for (hotel_id, month), nights in ledger.items():
+            capacity = capacities.get(hotel_id)
+            if capacity is not None:
+                over[hotel_id] += sum(1 for count in nights if count > capacity)
+        for hotel_id, count in sorted(over.items()):
+            if count:
+                print(f"Hotel {hotel_id} is over capacity on {count} nights")
+
+        if dry_run:
+            return
+
+        if operations:
+            await inventory.bulk_write(operations, ordered=False)
+
+        if orphans:
+            await RoomNight.get_motor_collection().delete_many({"_id": {"$in": orphans}})
+
+        conflicts = 0
+        if locks:
+            try:
+                await RoomNight.get_motor_collection().insert_many(locks, ordered=False)
+            except BulkWriteError as e:
+                # Locks already present are fine; a night locked by another reservation is a double booking
+                for error in e.details["writeErrors"]:
+                    night = error["op"]
+                    holder = await RoomNight.get_motor_collection().find_one(
+                        {"room_id": night["room_id"], "date": night["date"]}, {"reservation_id": 1}
+                    )
+                    if holder and holder["reservation_id"] != night["reservation_id"]:
+                        conflicts += 1
+                        print(
+                            f"Room {night['room_id']} is double booked on {night['date']}: "
+                            f"{holder['reservation_id']} and {night['reservation_id']}"
+                        )
+        print(f"{conflicts} room nights are double booked")
+
+        reservations = Reservation.get_motor_collection()
+        await reservations.update_many(
+            {"status": {"$in": ACTIVE_RESERVATION_STATUSES}}, {"$set": {"holds_capacity": True}}
+        )
+        await reservations.update_many(
+            {"status": {"$nin": ACTIVE_RESERVATION_STATUSES}}, {"$set": {"holds_capacity": False}}
+        )
+        print("Done: inventory ledger, room-night locks and holds_capacity rebuilt")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the hotel inventory ledger and room-night locks")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift, change nothing")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.dry_run))
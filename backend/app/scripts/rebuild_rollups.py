@@ -0,0 +1,71 @@
+"""
+Rebuild the dashboard revenue/occupancy day rollups from all reservations
+
+Marks every hotel's whole reservation history dirty, then refreshes until
+no dirty range is left. Needed once after deploying the rollups, and to
+repair them after changes made outside the API. Safe to run while the API
+is up: hotels are refreshed under a per-hotel lease, so the script and the
+API's refresh task never write the same hotel's rollups at once.
+
+Hotels leased by another refresher are retried every --poll-seconds until
+their lease is released or expires. When no range has been refreshed for
+--patience-seconds (default: one lease period), the script stops and
+lists the hotels still dirty, with their range counts (failed recomputes
+are in the logs).
+
+Usage (from the backend directory):
+    python -m app.scripts.rebuild_rollups [--poll-seconds 5] [--patience-seconds 300]
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.models.rollup import RollupDirtyRange
+from app.services.rollup_service import RollupService
+
+
+async def rebuild(poll_seconds: float, patience_seconds: float) -> None:
+    await connect_to_mongo()
+    try:
+        hotels = await RollupService.mark_all_dirty()
+        print(f"Marked {hotels} hotels dirty")
+        collection = RollupDirtyRange.get_motor_collection()
+        refreshed = 0
+        last_progress = time.monotonic()
+        while True:
+            batch = await RollupService.refresh()
+            if batch:
+                refreshed += batch
+                last_progress = time.monotonic()
+                print(f"Refreshed {refreshed} ranges...")
+                continue
+            remaining = await collection.count_documents({})
+            if not remaining or time.monotonic() - last_progress >= patience_seconds:
+                break
+            print(f"{remaining} ranges left, waiting for leased or failing hotels...")
+            await asyncio.sleep(poll_seconds)
+        print(f"Done: {refreshed} ranges refreshed")
+
+        leftovers = await collection.aggregate([
+            {"$group": {"_id": "$hotel_id", "ranges": {"$sum": 1}}},
+            {"$sort": {"_id": 1}}
+        ]).to_list(None)
+        for row in leftovers:
+            print(f"Hotel {row['_id']} still has {row['ranges']} dirty ranges")
+        if leftovers:
+            print(f"{len(leftovers)} hotels were not rebuilt (still leased, or failed: see the logs); run again")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the dashboard day rollups from all reservations")
+    parser.add_argument("--poll-seconds", type=float, default=5, help="Wait between retries of leased hotels")
+    parser.add_argument(
+        "--patience-seconds", type=float, default=settings.ROLLUP_LEASE_SECONDS,
+        help="Give up after this long without refreshing any range"
+    )
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.poll_seconds, args.patience_seconds))
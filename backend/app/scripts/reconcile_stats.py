@@ -0,0 +1,134 @@
+"""
+Rebuild the dashboard stats counters from the source collections
+
+The counters are maintained with $inc by the services, so a failed counter
+write or a change made outside the API leaves them off. This recomputes
+every scope with aggregations, prints the drift of each counter that
+differs, then overwrites the counters (scopes nothing maps to are removed).
+
+Usage (from the backend directory):
+    python -m app.scripts.reconcile_stats [--dry-run]
+
+With --dry-run only the drift is reported. Writes that land while the
+aggregations run can show up as drift on the next run; run it again
+when the API is quiet to confirm.
+"""
+import argparse
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict
+
+from pymongo import DeleteOne, ReplaceOne
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.models.booking import Reservation
+from app.models.hotel import Hotel
+from app.models.stats import Stats
+from app.models.user import User
+from app.services.stats_service import COUNTER_FIELDS, GLOBAL_SCOPE, admin_scope, hotel_scope
+
+
+def empty_counters() -> dict:
+    return {**{field: 0 for field in COUNTER_FIELDS}, "by_status": defaultdict(int)}
+
+
+async def aggregate(collection, pipeline) -> list:
+    return await collection.aggregate(pipeline).to_list(None)
+
+
+async def expected_counters() -> Dict[str, dict]:
+    """Counters per scope as they follow from the current users, hotels and reservations"""
+    scopes: Dict[str, dict] = defaultdict(empty_counters)
+    scopes[GLOBAL_SCOPE]  # Always present, even on an empty database
+
+    for row in await aggregate(User.get_motor_collection(), [
+        {"$group": {"_id": "$hotel_id", "users": {"$sum": 1}}}
+    ]):
+        scopes[GLOBAL_SCOPE]["users"] += row["users"]
+        if row["_id"]:
+            scopes[hotel_scope(row["_id"])]["users"] += row["users"]
+
+    creators = {}
+    for row in await aggregate(Hotel.get_motor_collection(), [
+        {"$project": {"created_by": 1, "is_active": 1}}
+    ]):
+        creators[str(row["_id"])] = row.get("created_by")
+        active = 1 if row.get("is_active", True) else 0
+        targets = [GLOBAL_SCOPE] + ([admin_scope(row["created_by"])] if row.get("created_by") else [])
+        for scope in targets:
+            scopes[scope]["hotels"] += 1
+            scopes[scope]["active_hotels"] += active
+
+    for row in await aggregate(Reservation.get_motor_collection(), [
+        {"$group": {
+            "_id": {"hotel_id": "$hotel_id", "status": "$status"},
+            "reservations": {"$sum": 1},
+            "revenue": {"$sum": "$total_price"}
+        }}
+    ]):
+        hotel_id, status = row["_id"]["hotel_id"], row["_id"]["status"]
+        targets = [GLOBAL_SCOPE, hotel_scope(hotel_id)]
+        if creators.get(hotel_id):
+            targets.append(admin_scope(creators[hotel_id]))
+        for scope in targets:
+            scopes[scope]["reservations"] += row["reservations"]
+            scopes[scope]["revenue"] += row["revenue"]
+            scopes[scope]["by_status"][status] += row["reservations"]
+
+    return scopes
+
+
+def drift(stored: dict, expected: dict) -> Dict[str, tuple]:
+    """(stored, expected) for every counter that differs"""
+    differences = {}
+    for field in COUNTER_FIELDS:
+        if abs(stored.get(field, 0) - expected[field]) > 1e-6:
+            differences[field] = (stored.get(field, 0), expected[field])
+    stored_by_status = stored.get("by_status", {})
+    for status in set(stored_by_status) | set(expected["by_status"]):
+        if stored_by_status.get(status, 0) != expected["by_status"].get(status, 0):
+            differences[f"by_status.{status}"] = (stored_by_status.get(status, 0), expected["by_status"].get(status, 0))
+    return differences
+
+
+async def reconcile(dry_run: bool) -> None:
+    await connect_to_mongo()
+    try:
+        expected = await expected_counters()
+        collection = Stats.get_motor_collection()
+        stored = {doc["scope"]: doc async for doc in collection.find({}, {"_id": 0})}
+
+        operations = []
+        drifted = 0
+        for scope in sorted(set(expected) | set(stored)):
+            counters = expected.get(scope, empty_counters())
+            differences = drift(stored.get(scope, {}), counters)
+            if differences:
+                drifted += 1
+                print(f"{scope}:")
+                for field, (was, should_be) in sorted(differences.items()):
+                    print(f"  {field}: {was} -> {should_be}")
+
+            if scope not in expected:
+                operations.append(DeleteOne({"scope": scope}))
+            elif differences or scope not in stored:
+                operations.append(ReplaceOne(
+                    {"scope": scope},
+                    {**counters, "by_status": dict(counters["by_status"]), "scope": scope, "updated_at": datetime.utcnow()},
+                    upsert=True
+                ))
+
+        print(f"{drifted} of {len(set(expected) | set(stored))} scopes drifted")
+        if operations and not dry_run:
+            await collection.bulk_write(operations, ordered=False)
+            print(f"Rewrote {len(operations)} scopes")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the dashboard stats counters and report drift")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift, leave the counters unchanged")
+    args = parser.parse_args()
+    asyncio.run(reconcile(args.dry_run))
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import DESCENDING
+
+from app.core.dates import time_ago
+from app.models.activity import ActivityEvent
+from app.services.loaders import hotel_ref_loader
+from app.services.stats_service import GLOBAL_SCOPE, admin_scope, hotel_scope
+
+logger = logging.getLogger(__name__)
+
+
+def _event(type: str, title: str, description: str, icon: str, scopes: List[str], created_at: datetime) -> Dict[str, Any]:
+    return {
+        "type": type,
+        "title": title,
+        "description": description,
+        "icon": icon,
+        "scopes": scopes,
+        "created_at": created_at
+    }
+
+
+class ActivityService:
+    @staticmethod
+    async def _insert(events: List[Dict[str, Any]]) -> None:
+        """Append events to the feed; failures are logged, never raised (the feed is best effort)"""
+        if not events:
+            return
+        try:
+            await ActivityEvent.get_motor_collection().insert_many(events, ordered=False)
+        except Exception:
+            logger.exception("Failed to record %d activity events", len(events))
+
+    @staticmethod
+    def user_registered(name: str, email: str, hotel_id: Optional[str], created_at: datetime) -> Dict[str, Any]:
+        scopes = [GLOBAL_SCOPE] + ([hotel_scope(hotel_id)] if hotel_id else [])
+        return _event(
+            "user_registration", "New user registration", f"{name} ({email}) joined", "users", scopes, created_at
+        )
+
+    @staticmethod
+    def hotel_added(name: str, city: str, created_by: Optional[str], created_at: datetime) -> Dict[str, Any]:
+        scopes = [GLOBAL_SCOPE] + ([admin_scope(created_by)] if created_by else [])
+        return _event("hotel_added", "New hotel added", f"{name} in {city}", "building", scopes, created_at)
+
+    @staticmethod
+    def booking_created(total_price: float, hotel, created_at: datetime) -> Dict[str, Any]:
+        """hotel is the booked hotel's response (or None if it is gone)"""
+        scopes = [GLOBAL_SCOPE] + ([admin_scope(hotel.created_by)] if hotel and hotel.created_by else [])
+        hotel_name = hotel.name if hotel else "Unknown Hotel"
+        return _event(
+            "booking_created", "New booking", f"${total_price} booking at {hotel_name}", "calendar", scopes, created_at
+        )
+
+    @staticmethod
+    async def record_user(name: str, email: str, hotel_id: Optional[str]) -> None:
+        await ActivityService._insert([ActivityService.user_registered(name, email, hotel_id, datetime.utcnow())])
+
+    @staticmethod
+    async def record_hotel(name: str, city: str, created_by: Optional[str]) -> None:
+        await ActivityService._insert([ActivityService.hotel_added(name, city, created_by, datetime.utcnow())])
+
+    @staticmethod
+    async def record_bookings(bookings: Iterable) -> None:
+        """Record reservations (anything with hotel_id and total_price); each distinct hotel is loaded once, concurrently"""
+        now = datetime.utcnow()
+        bookings = list(bookings)
+        hotel_ids = list({booking.hotel_id for booking in bookings})
+        hotels = dict(zip(hotel_ids, await asyncio.gather(*(hotel_ref_loader.load(hotel_id) for hotel_id in hotel_ids))))
+        await ActivityService._insert([
+            ActivityService.booking_created(booking.total_price, hotels[booking.hotel_id], now)
+            for booking in bookings
+        ])
+
+    @staticmethod
+    async def get_feed(scopes: List[str], limit: int) -> List[Dict[str, Any]]:
+        """
+        Newest events of the given scopes, shaped as dashboard recent_activity entries
+        
+        A single top-N read on the (scopes, created_at) index; an event in
+        several of the scopes is still returned once.
+        """
+        cursor = ActivityEvent.get_motor_collection().find(
+            {"scopes": {"$in": scopes}},
+            {"_id": 0, "type": 1, "title": 1, "description": 1, "icon": 1, "created_at": 1}
+        ).sort("created_at", DESCENDING).limit(limit)
+        return [
+            {
+                "type": event["type"],
+                "title": event["title"],
+                "description": event["description"],
+                "time": time_ago(event["created_at"]),
+                "icon": event["icon"]
+            }
+            async for event in cursor
+        ]
@@ -0,0 +1,140 @@
+import bisect
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models.booking import Reservation, ACTIVE_RESERVATION_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+class RoomIntervals:
+    """
+    Sorted interval array holding one room's active reservations
+    
+    Intervals are kept ordered by start date next to a running maximum of
+    end dates, so "does anything overlap [start, end]?" is a single bisect
+    plus one comparison. Dates are YYYY-MM-DD strings, which sort the same
+    way as the dates they represent.
+    """
+    __slots__ = ("starts", "ends", "ids", "max_ends")
+
+    def __init__(self):
+        self.starts: List[str] = []
+        self.ends: List[str] = []
+        self.ids: List[str] = []
+        self.max_ends: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, reservation_id: str, start_date: str, end_date: str) -> None:
+        i = bisect.bisect_right(self.starts, start_date)
+        self.starts.insert(i, start_date)
+        self.ends.insert(i, end_date)
+        self.ids.insert(i, reservation_id)
+        self.max_ends.insert(i, end_date)
+        self._refresh_max_ends(i)
+
+    def remove(self, reservation_id: str) -> bool:
+        try:
+            i = self.ids.index(reservation_id)
+        except ValueError:
+            return False
+        del self.starts[i], self.ends[i], self.ids[i], self.max_ends[i]
+        self._refresh_max_ends(i)
+        return True
+
+    def overlaps(self, start_date: str, end_date: str, exclude_id: Optional[str] = None) -> bool:
+        """Same inclusive overlap rule as the Mongo conflict query"""
+        # Only intervals starting on or before end_date can overlap
+        i = bisect.bisect_right(self.starts, end_date)
+        if exclude_id is None:
+            return i > 0 and self.max_ends[i - 1] >= start_date
+
+        # Walk back while some earlier interval could still reach start_date
+        j = i - 1
+        while j >= 0 and self.max_ends[j] >= start_date:
+            if self.ends[j] >= start_date and self.ids[j] != exclude_id:
+                return True
+            j -= 1
+        return False
+
+    def _refresh_max_ends(self, i: int) -> None:
+        running = self.max_ends[i - 1] if i > 0 else ""
+        for j in range(i, len(self.ends)):
+            running = max(running, self.ends[j])
+            self.max_ends[j] = running
+
+
+class AvailabilityIndex:
+    """
+    In-process availability index: one RoomIntervals per room
+    
+    Built at startup from the active reservations and kept current by
+    ReservationService writes. It only sees writes made by this process,
+    so it must stay disabled when several workers share the database
+    (or be run in verify mode, which cross-checks every answer with Mongo).
+    """
+
+    def __init__(self):
+        self._rooms: Dict[str, RoomIntervals] = {}
+        self._hotel_rooms: Dict[str, Set[str]] = defaultdict(set)
+        # reservation_id -> (hotel_id, room_id)
+        self._reservations: Dict[str, Tuple[str, str]] = {}
+        self.ready = False
+
+    async def build(self) -> None:
+        """Load every active reservation from the database"""
+        self._rooms.clear()
+        self._hotel_rooms.clear()
+        self._reservations.clear()
+
+        cursor = Reservation.get_motor_collection().find(
+            {"status": {"$in": ACTIVE_RESERVATION_STATUSES}},
+            {"hotel_id": 1, "room_id": 1, "start_date": 1, "end_date": 1}
+        )
+        async for doc in cursor:
+            self._add(str(doc["_id"]), doc["hotel_id"], doc["room_id"], doc["start_date"], doc["end_date"])
+
+        self.ready = True
+        logger.info("Availability index built with %d reservations over %d rooms", len(self._reservations), len(self._rooms))
+
+    def upsert(self, reservation_id: str, hotel_id: str, room_id: str, start_date: str, end_date: str, status: str) -> None:
+        """Record the current state of a reservation, dropping it if it no longer holds the room"""
+        self.remove(reservation_id)
+        if status in ACTIVE_RESERVATION_STATUSES:
+            self._add(reservation_id, hotel_id, room_id, start_date, end_date)
+
+    def remove(self, reservation_id: str) -> None:
+        entry = self._reservations.pop(reservation_id, None)
+        if entry is None:
+            return
+        hotel_id, room_id = entry
+        intervals = self._rooms.get(room_id)
+        if intervals is not None:
+            intervals.remove(reservation_id)
+            if not intervals:
+                del self._rooms[room_id]
+                self._hotel_rooms[hotel_id].discard(room_id)
+
+    def is_available(self, room_id: str, start_date: str, end_date: str, exclude_id: Optional[str] = None) -> bool:
+        intervals = self._rooms.get(room_id)
+        return intervals is None or not intervals.overlaps(start_date, end_date, exclude_id)
+
+    def booked_room_ids(self, hotel_id: str, start_date: str, end_date: str) -> List[str]:
+        return [
+            room_id for room_id in self._hotel_rooms.get(hotel_id, ())
+            if self._rooms[room_id].overlaps(start_date, end_date)
+        ]
+
+    def _add(self, reservation_id: str, hotel_id: str, room_id: str, start_date: str, end_date: str) -> None:
+        intervals = self._rooms.get(room_id)
+        if intervals is None:
+            intervals = self._rooms[room_id] = RoomIntervals()
+        intervals.add(reservation_id, start_date, end_date)
+        self._hotel_rooms[hotel_id].add(room_id)
+        self._reservations[reservation_id] = (hotel_id, room_id)
+
+
+availability_index = AvailabilityIndex()
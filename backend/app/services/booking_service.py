@@ -1,124 +1,439 @@
-from typing import List, Optional
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, Union
 from datetime import datetime
 from beanie import PydanticObjectId
+from bson import ObjectId
 
-from app.models.booking import Reservation, ReservationCreate, ReservationUpdate, ReservationResponse
-from app.models.user import User
-from app.models.hotel import Hotel
-from app.models.room import Room
+from app.core.config import settings
+from app.core.dates import stay_nights, stay_length, day_ordinal
+from app.core.metrics import booking_latency
+from app.core.cache import VersionedCache
+from app.core.fields import Fields
+from app.core.read_models import (
+    Lookups, find_one_response, find_responses, find_expanded_responses, find_responses_by_ids
+)
+from app.models.booking import (
+    Reservation, ReservationCreate, ReservationUpdate, ReservationResponse, ReservationExpandedResponse,
+    ACTIVE_RESERVATION_STATUSES, BulkReservationResult, BulkReservationResponse
+)
+from app.models.user import User, UserResponse
+from app.models.hotel import Hotel, HotelResponse
+from app.models.inventory import HotelCapacityResponse
+from app.models.batch import BatchResponse
+from app.models.room import Room, RoomResponse
+from app.services.availability_index import availability_index
+from app.services.inventory_service import InventoryService
+from app.services.room_night_service import RoomNightService
+from app.services.loaders import hotel_ref_loader, room_ref_loader, user_ref_loader
+from app.services.stats_service import StatsService, reservation_deltas
+from app.services.rollup_service import RollupService
+from app.services.activity_service import ActivityService
+
+logger = logging.getLogger(__name__)
+
+# Available rooms per (hotel_id, start_date, end_date), versioned per hotel
+availability_cache = VersionedCache(settings.AVAILABILITY_CACHE_SIZE, settings.AVAILABILITY_CACHE_TTL_SECONDS)
+
+# Links a reservation read can embed with ?expand=
+RESERVATION_EXPANSIONS: Lookups = {
+    "hotel": ("hotel_id", Hotel, HotelResponse),
+    "room": ("room_id", Room, RoomResponse),
+    "visitor": ("visitor_id", User, UserResponse)
+}
+
+
+def overlap_query(start_date: str, end_date: str) -> dict:
+    """Mongo filter matching active reservations that overlap the given date range"""
+    if settings.RESERVATION_DAY_QUERIES:
+        return {
+            "status": {"$in": ACTIVE_RESERVATION_STATUSES},
+            "start_day": {"$lte": day_ordinal(end_date)},
+            "end_day": {"$gte": day_ordinal(start_date)}
+        }
+    return {
+        "status": {"$in": ACTIVE_RESERVATION_STATUSES},
+        "start_date": {"$lte": end_date},
+        "end_date": {"$gte": start_date}
+    }
 
 
 class ReservationService:
     @staticmethod
     async def create_reservation(reservation_data: ReservationCreate) -> Optional[ReservationResponse]:
-        """Create a new reservation"""
-        try:
-            print(f"Creating reservation: {reservation_data}")  # For debugging
-            
-            # Verify all referenced entities exist
-            print(f"Checking hotel_id: {reservation_data.hotel_id}")
-            hotel = await Hotel.get(PydanticObjectId(reservation_data.hotel_id))
-            if not hotel:
-                print(f"Hotel not found: {reservation_data.hotel_id}")
-                return None
-                
-            print(f"Checking room_id: {reservation_data.room_id}")
-            room = await Room.get(PydanticObjectId(reservation_data.room_id))
-            if not room:
-                print(f"Room not found: {reservation_data.room_id}")
-                return None
-                
-            print(f"Checking visitor_id: {reservation_data.visitor_id}")
-            visitor = await User.get(PydanticObjectId(reservation_data.visitor_id))
-            if not visitor:
-                print(f"Visitor not found: {reservation_data.visitor_id}")
+        """
+        Create a new reservation
+        
+        Hotel, room and visitor are verified concurrently through the narrow
+        batching loaders (only the fields bookings read, coalesced with other
+        lookups in flight) and stored as links
+        by id, without loading Beanie documents. Each stage is timed in
+        booking_latency.
+        """
+        with booking_latency.measure("total"):
+            try:
+                return await ReservationService._create_reservation(reservation_data)
+            except ValueError as ve:
+                logger.info("Validation error creating reservation: %s", ve)
                 return None
-            
-            # Check if room belongs to hotel
-            print(f"Room hotel_id: {room.hotel_id}, Expected hotel_id: {reservation_data.hotel_id}")
-            if room.hotel_id != reservation_data.hotel_id:
-                print(f"Room does not belong to hotel. Room hotel_id: {room.hotel_id}, Expected: {reservation_data.hotel_id}")
+            except Exception:
+                logger.exception("Error creating reservation")
                 return None
-            
-            # Check for conflicting reservations using string date comparison
-            print(f"Checking for conflicts for room {reservation_data.room_id} from {reservation_data.start_date} to {reservation_data.end_date}")
-            conflicting = await Reservation.find({
-                "room_id": reservation_data.room_id,
-                "status": {"$in": ["confirmed", "checked_in"]},
-                "$or": [
-                    {
-                        "start_date": {"$lte": reservation_data.end_date},
-                        "end_date": {"$gte": reservation_data.start_date}
-                    }
-                ]
-            }).to_list()
-            
-            if conflicting:
-                print(f"Found {len(conflicting)} conflicting reservations")
-                for conflict in conflicting:
-                    print(f"Conflict: {conflict.start_date} to {conflict.end_date}, status: {conflict.status}")
-                print(f"RESERVATION FAILED: Room {reservation_data.room_id} is already booked for the requested dates")
-                return None  # Room is not available for these dates
-            
-            print("No conflicts found, creating reservation...")
-            
-            # Create reservation directly with string dates
-            reservation = Reservation(
-                hotel_id=reservation_data.hotel_id,
-                room_id=reservation_data.room_id,
-                visitor_id=reservation_data.visitor_id,
-                start_date=reservation_data.start_date,
-                end_date=reservation_data.end_date,
-                type=reservation_data.type,
-                status=reservation_data.status,
-                total_price=reservation_data.total_price,
-                hotel=hotel,
-                room=room,
-                visitor=visitor
+
+    @staticmethod
+    async def _create_reservation(reservation_data: ReservationCreate) -> Optional[ReservationResponse]:
+        hotel_id = PydanticObjectId(reservation_data.hotel_id)
+        room_id = PydanticObjectId(reservation_data.room_id)
+        visitor_id = PydanticObjectId(reservation_data.visitor_id)
+
+        # Verify all referenced entities exist
+        with booking_latency.measure("verify_references"):
+            hotel, room, visitor = await asyncio.gather(
+                hotel_ref_loader.load(reservation_data.hotel_id),
+                room_ref_loader.load(reservation_data.room_id),
+                user_ref_loader.load(reservation_data.visitor_id)
+            )
+        if not hotel or not room or not visitor:
+            logger.info(
+                "Reservation rejected, missing reference: hotel=%s room=%s visitor=%s",
+                bool(hotel), bool(room), bool(visitor)
             )
-            
-            print(f"About to save reservation: {reservation}")
-            await reservation.create()
-            print(f"Reservation created successfully with ID: {reservation.id}")
-            
-            return ReservationResponse.model_validate({
-                **reservation.model_dump(),
-                "id": str(reservation.id)
-            })
-        except ValueError as ve:
-            print(f"Validation error creating reservation: {ve}")  # For debugging
             return None
-        except Exception as e:
-            print(f"Error creating reservation: {e}")  # For debugging
-            print(f"Exception type: {type(e)}")  # For debugging
+
+        # Check if room belongs to hotel
+        if room.hotel_id != reservation_data.hotel_id:
+            logger.info("Reservation rejected, room %s does not belong to hotel %s", room_id, hotel_id)
             return None
 
+        with booking_latency.measure("conflict_check"):
+            has_conflict = await ReservationService._has_conflict(
+                reservation_data.room_id, reservation_data.start_date, reservation_data.end_date
+            )
+        if has_conflict:
+            logger.info(
+                "Reservation rejected, room %s is already booked from %s to %s",
+                room_id, reservation_data.start_date, reservation_data.end_date
+            )
+            return None  # Room is not available for these dates
+
+        # Lock the room's nights and take the hotel's capacity before writing the reservation
+        reservation_id = PydanticObjectId()
+        holds_room = reservation_data.status in ACTIVE_RESERVATION_STATUSES
+        if holds_room:
+            with booking_latency.measure("holds"):
+                held = await ReservationService._take_holds(
+                    str(reservation_id), reservation_data.hotel_id, reservation_data.room_id,
+                    hotel.max_reservations_capacity, reservation_data.start_date, reservation_data.end_date
+                )
+            if not held:
+                logger.info(
+                    "Reservation rejected, room %s or hotel %s is no longer available from %s to %s",
+                    room_id, hotel_id, reservation_data.start_date, reservation_data.end_date
+                )
+                return None
+
+        reservation = Reservation(
+            id=reservation_id,
+            **reservation_data.model_dump(),
+            holds_capacity=holds_room,
+            hotel=Hotel.link_from_id(hotel_id),
+            room=Room.link_from_id(room_id),
+            visitor=User.link_from_id(visitor_id)
+        )
+
+        with booking_latency.measure("insert"):
+            try:
+                await reservation.create()
+            except Exception:
+                if holds_room:
+                    await ReservationService._release_holds(
+                        str(reservation_id), reservation_data.hotel_id,
+                        reservation_data.start_date, reservation_data.end_date
+                    )
+                raise
+        logger.debug("Reservation %s created", reservation_id)
+        ReservationService._index_reservation(reservation)
+        availability_cache.bump(reservation.hotel_id)
+        await ReservationService._record_changes(
+            [(reservation.hotel_id, reservation_deltas(reservation.status, reservation.total_price))],
+            [(reservation.hotel_id, reservation.start_date, reservation.end_date)],
+            [reservation]
+        )
+
+        return ReservationResponse.model_validate({
+            **reservation.model_dump(),
+            "id": str(reservation.id)
+        })
+
     @staticmethod
-    async def get_reservation(reservation_id: str) -> Optional[ReservationResponse]:
-        """Get a reservation by ID"""
+    async def create_reservations_bulk(
+        items: List[ReservationCreate],
+        all_or_nothing: bool = False
+    ) -> BulkReservationResponse:
+        """
+        Create many reservations with a number of round trips that does not grow with the batch
+        
+        Hotels, rooms and visitors are verified with one $in query per collection,
+        conflicts for every room with one query, room nights are locked with one
+        unordered insert, hotel capacity is taken with one conditional update per
+        hotel-month (sent concurrently, see InventoryService.claim_many) and the
+        reservations are written with insert_many. Only a hotel whose combined
+        claim does not fit falls back to claiming its items one by one.
+        With all_or_nothing, a single failing item fails the whole batch.
+        """
+        errors: Dict[int, str] = {}
+        for index, item in enumerate(items):
+            if not all(ObjectId.is_valid(ref) for ref in (item.hotel_id, item.room_id, item.visitor_id)):
+                errors[index] = "Invalid hotel, room or visitor id"
+
+        def object_ids(values):
+            return list({ObjectId(value) for value in values if ObjectId.is_valid(value)})
+
+        hotel_docs, room_docs, visitor_docs = await asyncio.gather(
+            Hotel.get_motor_collection().find(
+                {"_id": {"$in": object_ids(item.hotel_id for item in items)}},
+                {"max_reservations_capacity": 1}
+            ).to_list(length=None),
+            Room.get_motor_collection().find(
+                {"_id": {"$in": object_ids(item.room_id for item in items)}},
+                {"hotel_id": 1}
+            ).to_list(length=None),
+            User.get_motor_collection().find(
+                {"_id": {"$in": object_ids(item.visitor_id for item in items)}},
+                {"_id": 1}
+            ).to_list(length=None)
+        )
+        capacities = {str(doc["_id"]): doc["max_reservations_capacity"] for doc in hotel_docs}
+        room_hotels = {str(doc["_id"]): doc["hotel_id"] for doc in room_docs}
+        visitor_ids = {str(doc["_id"]) for doc in visitor_docs}
+
+        for index, item in enumerate(items):
+            if index in errors:
+                continue
+            if item.hotel_id not in capacities:
+                errors[index] = "Hotel not found"
+            elif item.room_id not in room_hotels:
+                errors[index] = "Room not found"
+            elif item.visitor_id not in visitor_ids:
+                errors[index] = "Visitor not found"
+            elif room_hotels[item.room_id] != item.hotel_id:
+                errors[index] = "Room does not belong to hotel"
+
+        # One conflict query covering every room over the whole batch window
+        candidates = [index for index in range(len(items)) if index not in errors]
+        if candidates:
+            existing = await Reservation.get_motor_collection().find(
+                {
+                    "room_id": {"$in": list({items[index].room_id for index in candidates})},
+                    **overlap_query(
+                        min(items[index].start_date for index in candidates),
+                        max(items[index].end_date for index in candidates)
+                    )
+                },
+                {"room_id": 1, "start_date": 1, "end_date": 1}
+            ).to_list(length=None)
+            booked: Dict[str, List[tuple]] = {}
+            for doc in existing:
+                booked.setdefault(doc["room_id"], []).append((doc["start_date"], doc["end_date"]))
+
+            for index in candidates:
+                item = items[index]
+                if any(start <= item.end_date and end >= item.start_date for start, end in booked.get(item.room_id, [])):
+                    errors[index] = "Room is already booked for the requested dates"
+                elif item.status in ACTIVE_RESERVATION_STATUSES:
+                    # Later items in the batch must not overlap earlier ones
+                    booked.setdefault(item.room_id, []).append((item.start_date, item.end_date))
+
+        if all_or_nothing and errors:
+            return ReservationService._bulk_response(items, errors, [])
+
+        # Lock room nights for all holding reservations at once, then take hotel capacity
+        reservation_ids = {index: PydanticObjectId() for index in range(len(items)) if index not in errors}
+        holding = [index for index in reservation_ids if items[index].status in ACTIVE_RESERVATION_STATUSES]
         try:
-            reservation = await Reservation.get(PydanticObjectId(reservation_id), fetch_links=True)
-            if reservation:
-                return ReservationResponse.model_validate({
-                    **reservation.model_dump(),
-                    "id": str(reservation.id)
-                })
+            lost = await RoomNightService.claim_many([
+                (
+                    items[index].room_id,
+                    str(reservation_ids[index]),
+                    [night.isoformat() for night in stay_nights(items[index].start_date, items[index].end_date)]
+                )
+                for index in holding
+            ])
+            full = await InventoryService.claim_many({
+                index: (items[index].hotel_id, capacities[items[index].hotel_id], items[index].start_date, items[index].end_date)
+                for index in holding
+                if str(reservation_ids[index]) not in lost
+            })
+        except Exception:
+            # Ledger months taken before the error are put right by rebuild_inventory
+            await RoomNightService.release_many([str(reservation_ids[index]) for index in holding])
+            raise
+        await RoomNightService.release_many([str(reservation_ids[index]) for index in full])
+        held = []
+        for index in holding:
+            if str(reservation_ids[index]) in lost:
+                errors[index] = "Room is already booked for the requested dates"
+            elif index in full:
+                errors[index] = "Hotel is at capacity for the requested dates"
+            else:
+                held.append(index)
+
+        if all_or_nothing and errors:
+            for index in held:
+                await ReservationService._release_holds(
+                    str(reservation_ids[index]), items[index].hotel_id, items[index].start_date, items[index].end_date
+                )
+            return ReservationService._bulk_response(items, errors, [])
+
+        reservations = [
+            Reservation(
+                id=reservation_ids[index],
+                **items[index].model_dump(),
+                holds_capacity=index in held,
+                hotel=Hotel.link_from_id(PydanticObjectId(items[index].hotel_id)),
+                room=Room.link_from_id(PydanticObjectId(items[index].room_id)),
+                visitor=User.link_from_id(PydanticObjectId(items[index].visitor_id))
+            )
+            for index in reservation_ids if index not in errors
+        ]
+        if reservations:
+            try:
+                await Reservation.insert_many(reservations)
+            except Exception:
+                logger.exception("Error inserting bulk reservations")
+                for index in held:
+                    await ReservationService._release_holds(
+                        str(reservation_ids[index]), items[index].hotel_id, items[index].start_date, items[index].end_date
+                    )
+                for index in reservation_ids:
+                    errors.setdefault(index, "Could not save reservation")
+                return ReservationService._bulk_response(items, errors, [])
+
+        for reservation in reservations:
+            ReservationService._index_reservation(reservation)
+            availability_cache.bump(reservation.hotel_id)
+        await ReservationService._record_changes(
+            [
+                (reservation.hotel_id, reservation_deltas(reservation.status, reservation.total_price))
+                for reservation in reservations
+            ],
+            [(reservation.hotel_id, reservation.start_date, reservation.end_date) for reservation in reservations],
+            reservations
+        )
+        return ReservationService._bulk_response(items, errors, reservations)
+
+    @staticmethod
+    def _bulk_response(
+        items: List[ReservationCreate],
+        errors: Dict[int, str],
+        reservations: List[Reservation]
+    ) -> BulkReservationResponse:
+        created = iter(reservations)
+        results = []
+        for index in range(len(items)):
+            if index in errors:
+                results.append(BulkReservationResult(index=index, success=False, error=errors[index]))
+            elif not reservations:
+                results.append(BulkReservationResult(
+                    index=index, success=False, error="Not created because another reservation in the batch failed"
+                ))
+            else:
+                reservation = next(created)
+                results.append(BulkReservationResult(
+                    index=index,
+                    success=True,
+                    reservation=ReservationResponse.model_validate({
+                        **reservation.model_dump(),
+                        "id": str(reservation.id)
+                    })
+                ))
+        return BulkReservationResponse(
+            created=len(reservations),
+            failed=len(items) - len(reservations),
+            results=results
+        )
+
+    @staticmethod
+    async def get_reservation(
+        reservation_id: str,
+        fields: Optional[Fields] = None,
+        expand: Optional[Fields] = None
+    ) -> Optional[ReservationResponse]:
+        """Get a reservation by ID (only the given fields when set, with the expand links embedded)"""
+        try:
+            if expand:
+                if not ObjectId.is_valid(reservation_id):
+                    return None
+                reservations = await ReservationService._find_reservations(
+                    {"_id": ObjectId(reservation_id)}, limit=1, fields=fields, expand=expand
+                )
+                return reservations[0] if reservations else None
+            return await find_one_response(Reservation, ReservationResponse, reservation_id, fields=fields)
         except Exception:
             return None
-        return None
 
     @staticmethod
-    async def get_reservations(skip: int = 0, limit: int = 100) -> List[ReservationResponse]:
-        """Get all reservations with pagination"""
-        reservations = await Reservation.find().skip(skip).limit(limit).to_list()
+    async def get_reservations_by_ids(
+        reservation_ids: List[str],
+        visible_to: User
+    ) -> BatchResponse[ReservationResponse]:
+        """
+        Get many reservations by ID in one query, in request order
         
-        return [
-            ReservationResponse.model_validate({
-                **reservation.model_dump(),
-                "id": str(reservation.id)
-            })
-            for reservation in reservations
-        ]
+        Only reservations visible_to may see (same rules as
+        GET /reservations/{id}) are returned; the others are reported as missing.
+        """
+        if visible_to.role == "viewer":
+            query = {"visitor_id": str(visible_to.id)}
+        elif visible_to.role == "admin_hotel":
+            query = {"hotel_id": visible_to.hotel_id}
+        else:
+            query = {}
+        items, missing = await find_responses_by_ids(Reservation, ReservationResponse, reservation_ids, query)
+        return BatchResponse[ReservationResponse](items=items, missing=missing)
+
+    @staticmethod
+    async def _find_reservations(
+        query: dict,
+        skip: int = 0,
+        limit: int = 0,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        expand: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[ReservationResponse]:
+        """
+        Read a page of reservations, embedding the expand links in one aggregation
+        
+        Without expand this is a plain projected find; links are never
+        fetched unless asked for. With expand, fields must include the
+        expanded names (see selected_fields).
+        """
+        if expand:
+            return await find_expanded_responses(
+                Reservation, ReservationExpandedResponse, query,
+                {name: RESERVATION_EXPANSIONS[name] for name in sorted(expand)},
+                skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+            )
+        return await find_responses(
+            Reservation, ReservationResponse, query,
+            skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+        )
+
+    @staticmethod
+    async def get_reservations(
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        expand: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[ReservationResponse]:
+        """Get all reservations with pagination (skip/limit or keyset after_id)"""
+        return await ReservationService._find_reservations(
+            {}, skip=skip, limit=limit, after_id=after_id, fields=fields, expand=expand,
+            include_total=include_total
+        )
 
     @staticmethod
     async def update_reservation(reservation_id: str, reservation_data: ReservationUpdate) -> Optional[ReservationResponse]:
@@ -132,35 +447,49 @@ class ReservationService:
             
             if update_data:
                 update_data["updated_at"] = datetime.utcnow()
+                start_date = update_data.get("start_date", reservation.start_date)
+                end_date = update_data.get("end_date", reservation.end_date)
+                if not 0 < stay_length(start_date, end_date) <= settings.MAX_STAY_NIGHTS:
+                    return None  # Ends before it starts or longer than MAX_STAY_NIGHTS
+                if "start_date" in update_data:
+                    update_data["start_day"] = day_ordinal(start_date)
+                if "end_date" in update_data:
+                    update_data["end_day"] = day_ordinal(end_date)
                 
                 # If updating dates, check for conflicts
                 if "start_date" in update_data or "end_date" in update_data:
-                    start_date = update_data.get("start_date", reservation.start_date)
-                    end_date = update_data.get("end_date", reservation.end_date)
+                    has_conflict = await ReservationService._has_conflict(
+                        reservation.room_id, start_date, end_date, exclude_id=str(reservation.id)
+                    )
                     
-                    conflicting = await Reservation.find({
-                        "room_id": reservation.room_id,
-                        "status": {"$in": ["confirmed", "checked_in"]},
-                        "_id": {"$ne": reservation.id},
-                        "$or": [
-                            {
-                                "start_date": {"$lte": end_date},
-                                "end_date": {"$gte": start_date}
-                            }
-                        ]
-                    }).to_list()
-                    
-                    if conflicting:
+                    if has_conflict:
                         return None  # Conflict with existing reservation
                 
+                # Move the reservation's room-night locks and hotel capacity
+                status = update_data.get("status", reservation.status)
+                moved = await ReservationService._move_holds(reservation, start_date, end_date, status)
+                if not moved:
+                    return None  # Nights taken concurrently or hotel at capacity
+                update_data["holds_capacity"] = reservation.holds_capacity
+                
+                old_status, old_price = reservation.status, reservation.total_price
+                old_range = (reservation.hotel_id, reservation.start_date, reservation.end_date)
                 await reservation.update({"$set": update_data})
                 
                 # Fetch updated reservation
-                updated_reservation = await Reservation.get(PydanticObjectId(reservation_id))
-                return ReservationResponse.model_validate({
-                    **updated_reservation.model_dump(),
-                    "id": str(updated_reservation.id)
-                })
+                updated_reservation = await find_one_response(Reservation, ReservationResponse, reservation_id)
+                ReservationService._index_reservation(updated_reservation)
+                availability_cache.bump(updated_reservation.hotel_id)
+                stats_changes = []
+                if "status" in update_data or "total_price" in update_data:
+                    deltas = reservation_deltas(old_status, old_price, sign=-1)
+                    for field, value in reservation_deltas(updated_reservation.status, updated_reservation.total_price).items():
+                        deltas[field] = deltas.get(field, 0) + value
+                    stats_changes.append((updated_reservation.hotel_id, deltas))
+                await ReservationService._record_changes(stats_changes, [
+                    old_range, (updated_reservation.hotel_id, updated_reservation.start_date, updated_reservation.end_date)
+                ])
+                return updated_reservation
         except Exception:
             return None
         return None
@@ -172,78 +501,275 @@ class ReservationService:
             reservation = await Reservation.get(PydanticObjectId(reservation_id))
             if reservation:
                 await reservation.delete()
+                if reservation.status in ACTIVE_RESERVATION_STATUSES:
+                    await ReservationService._release_holds(
+                        reservation_id, reservation.hotel_id, reservation.start_date, reservation.end_date,
+                        holds_capacity=reservation.holds_capacity
+                    )
+                availability_index.remove(reservation_id)
+                availability_cache.bump(reservation.hotel_id)
+                await ReservationService._record_changes(
+                    [(reservation.hotel_id, reservation_deltas(reservation.status, reservation.total_price, sign=-1))],
+                    [(reservation.hotel_id, reservation.start_date, reservation.end_date)]
+                )
                 return True
         except Exception:
             pass
         return False
 
     @staticmethod
-    async def get_reservations_by_hotel(hotel_id: str, skip: int = 0, limit: int = 100) -> List[ReservationResponse]:
+    async def get_reservations_by_hotel(
+        hotel_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        expand: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[ReservationResponse]:
         """Get reservations by hotel"""
-        reservations = await Reservation.find(
-            {"hotel_id": hotel_id}
-        ).skip(skip).limit(limit).to_list()
-        
-        return [
-            ReservationResponse.model_validate({
-                **reservation.model_dump(),
-                "id": str(reservation.id)
-            })
-            for reservation in reservations
-        ]
+        return await ReservationService._find_reservations(
+            {"hotel_id": hotel_id}, skip=skip, limit=limit, after_id=after_id, fields=fields, expand=expand,
+            include_total=include_total
+        )
 
     @staticmethod
-    async def get_reservations_by_user(user_id: str, skip: int = 0, limit: int = 100) -> List[ReservationResponse]:
+    async def get_reservations_by_user(
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        expand: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[ReservationResponse]:
         """Get reservations by user"""
-        reservations = await Reservation.find(
-            {"visitor_id": user_id}
-        ).skip(skip).limit(limit).to_list()
+        return await ReservationService._find_reservations(
+            {"visitor_id": user_id}, skip=skip, limit=limit, after_id=after_id, fields=fields, expand=expand,
+            include_total=include_total
+        )
+
+    @staticmethod
+    async def _has_conflict(room_id: str, start_date: str, end_date: str, exclude_id: Optional[str] = None) -> bool:
+        """
+        Check whether an active reservation already holds the room for any of the dates
         
-        return [
-            ReservationResponse.model_validate({
-                **reservation.model_dump(),
-                "id": str(reservation.id)
-            })
-            for reservation in reservations
-        ]
+        Answered from the in-process availability index when it is enabled;
+        in verify mode the database stays authoritative and disagreements are logged.
+        """
+        if availability_index.ready:
+            indexed = not availability_index.is_available(room_id, start_date, end_date, exclude_id)
+            if not settings.AVAILABILITY_INDEX_VERIFY:
+                return indexed
+
+        query = {"room_id": room_id, **overlap_query(start_date, end_date)}
+        if exclude_id:
+            query["_id"] = {"$ne": PydanticObjectId(exclude_id)}
+        conflict = await Reservation.get_motor_collection().find_one(query, {"_id": 1})
+
+        if availability_index.ready and indexed != (conflict is not None):
+            logger.warning(
+                "Availability index mismatch for room %s (%s..%s): index=%s db=%s",
+                room_id, start_date, end_date, indexed, conflict is not None
+            )
+        return conflict is not None
+
+    @staticmethod
+    async def _take_holds(
+        reservation_id: str,
+        hotel_id: str,
+        room_id: str,
+        capacity: int,
+        start_date: str,
+        end_date: str
+    ) -> bool:
+        """
+        Lock the room's nights and take the hotel's nightly capacity for a reservation
+        
+        Both succeed or neither does. The room-night locks are the atomic guard
+        against double booking; the inventory ledger enforces hotel capacity.
+        The locks are also released when a claim raises; ledger months taken
+        before such an error are put right by rebuild_inventory.
+        """
+        nights = [night.isoformat() for night in stay_nights(start_date, end_date)]
+        held = False
+        try:
+            held = (
+                await RoomNightService.claim(room_id, reservation_id, nights)
+                and await InventoryService.claim(hotel_id, capacity, start_date, end_date)
+            )
+        finally:
+            if not held:
+                await RoomNightService.release(reservation_id)
+        return held
+
+    @staticmethod
+    async def _release_holds(
+        reservation_id: str,
+        hotel_id: str,
+        start_date: str,
+        end_date: str,
+        holds_capacity: bool = True
+    ) -> None:
+        """
+        Give back everything taken by _take_holds()
+        
+        holds_capacity=False skips the inventory ledger, for reservations
+        that never counted in it (made before it existed, until rebuilt).
+        """
+        await RoomNightService.release(reservation_id)
+        if holds_capacity:
+            await InventoryService.release(hotel_id, start_date, end_date)
+
+    @staticmethod
+    async def _move_holds(reservation: Reservation, start_date: str, end_date: str, status: str) -> bool:
+        """
+        Move a reservation's holds to new dates and/or status
+        
+        Only nights the reservation does not hold yet are locked, so nights it
+        keeps are never released in between. On failure the old holds stay as they were.
+        On success reservation.holds_capacity tells whether it now counts in
+        the inventory ledger; the caller saves it.
+        """
+        held_before = reservation.status in ACTIVE_RESERVATION_STATUSES
+        held_after = status in ACTIVE_RESERVATION_STATUSES
+        same_dates = (start_date, end_date) == (reservation.start_date, reservation.end_date)
+        if held_before == held_after and (not held_after or same_dates):
+            return True
+
+        reservation_id = str(reservation.id)
+        old_nights = set()
+        new_nights = set()
+        if held_before:
+            old_nights = {night.isoformat() for night in stay_nights(reservation.start_date, reservation.end_date)}
+        if held_after:
+            new_nights = {night.isoformat() for night in stay_nights(start_date, end_date)}
+
+        added_nights = sorted(new_nights - old_nights)
+        if not await RoomNightService.claim(reservation.room_id, reservation_id, added_nights):
+            return False
+
+        released = held_before and reservation.holds_capacity
+        if released:
+            await InventoryService.release(reservation.hotel_id, reservation.start_date, reservation.end_date)
+        if held_after:
+            hotel = await hotel_ref_loader.load(reservation.hotel_id)
+            claimed = hotel is not None and await InventoryService.claim(
+                reservation.hotel_id, hotel.max_reservations_capacity, start_date, end_date
+            )
+            if not claimed:
+                if released:
+                    await InventoryService.claim(reservation.hotel_id, None, reservation.start_date, reservation.end_date)
+                await RoomNightService.release(reservation_id, added_nights)
+                return False
+
+        await RoomNightService.release(reservation_id, sorted(old_nights - new_nights))
+        reservation.holds_capacity = held_after
+        return True
+
+    @staticmethod
+    async def _record_changes(
+        stats_changes: List[tuple],
+        dirty_ranges: List[tuple],
+        bookings: Sequence[Reservation] = ()
+    ) -> None:
+        """
+        Update the stats counters, rollups and activity feed after reservations were saved
+        
+        Best effort and run concurrently: the reservations are already written,
+        so failures are only logged. reconcile_stats, rebuild_rollups and
+        backfill_activity repair whatever was missed.
+        """
+        steps = {
+            "stats counters": StatsService.record_reservations(stats_changes),
+            "rollup dirty ranges": RollupService.mark_dirty(dirty_ranges)
+        }
+        if bookings:
+            steps["booking activity"] = ActivityService.record_bookings(bookings)
+        results = await asyncio.gather(*steps.values(), return_exceptions=True)
+        for step, result in zip(steps, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to update %s after saving reservations", step, exc_info=result)
+
+    @staticmethod
+    def _index_reservation(reservation: Union[Reservation, ReservationResponse]) -> None:
+        """Mirror a saved reservation into the availability index"""
+        if availability_index.ready:
+            availability_index.upsert(
+                str(reservation.id), reservation.hotel_id, reservation.room_id,
+                reservation.start_date, reservation.end_date, reservation.status
+            )
 
     @staticmethod
     async def check_room_availability(room_id: str, start_date: str, end_date: str) -> bool:
         """Check if a room is available for the given dates"""
         try:
-            conflicting = await Reservation.find({
-                "room_id": room_id,
-                "status": {"$in": ["confirmed", "checked_in"]},
-                "$or": [
-                    {
-                        "start_date": {"$lte": end_date},
-                        "end_date": {"$gte": start_date}
-                    }
-                ]
-            }).to_list()
-            
-            return len(conflicting) == 0
-        except Exception as e:
-            print(f"Error checking room availability: {e}")
+            return not await ReservationService._has_conflict(room_id, start_date, end_date)
+        except Exception:
+            logger.exception("Error checking room availability")
             return False
 
     @staticmethod
-    async def get_available_rooms_by_hotel(hotel_id: str, start_date: str, end_date: str) -> List:
-        """Get available rooms for a hotel within the given date range"""
+    async def get_booked_room_ids(hotel_id: str, start_date: str, end_date: str) -> List[str]:
+        """Get ids of the hotel's rooms that are booked within the given date range"""
+        if availability_index.ready and not settings.AVAILABILITY_INDEX_VERIFY:
+            return availability_index.booked_room_ids(hotel_id, start_date, end_date)
+
+        booked = await Reservation.get_motor_collection().distinct(
+            "room_id",
+            {"hotel_id": hotel_id, **overlap_query(start_date, end_date)}
+        )
+        if availability_index.ready:
+            indexed = availability_index.booked_room_ids(hotel_id, start_date, end_date)
+            if set(indexed) != set(booked):
+                logger.warning(
+                    "Availability index mismatch for hotel %s (%s..%s): index=%s db=%s",
+                    hotel_id, start_date, end_date, sorted(indexed), sorted(booked)
+                )
+        return booked
+
+    @staticmethod
+    async def get_remaining_capacity(hotel_id: str, start_date: str, end_date: str) -> Optional[HotelCapacityResponse]:
+        """Get how many more reservations the hotel can take for every night of the range"""
+        try:
+            hotel = await hotel_ref_loader.load(hotel_id)
+            if not hotel:
+                return None
+            remaining = await InventoryService.get_remaining_capacity(
+                hotel_id, hotel.max_reservations_capacity, start_date, end_date
+            )
+            return HotelCapacityResponse(
+                hotel_id=hotel_id,
+                start_date=start_date,
+                end_date=end_date,
+                max_reservations_capacity=hotel.max_reservations_capacity,
+                remaining_capacity=remaining
+            )
+        except Exception:
+            logger.exception("Error getting hotel capacity")
+            return None
+
+    @staticmethod
+    async def get_available_rooms_by_hotel(hotel_id: str, start_date: str, end_date: str) -> List[RoomResponse]:
+        """
+        Get available rooms for a hotel within the given date range
+        
+        Runs two set-based queries regardless of the number of rooms:
+        one distinct() over the overlapping reservations and one room
+        lookup that excludes the booked room ids. Results are cached until
+        a reservation or room write bumps the hotel's version.
+        """
+        cached = availability_cache.get(hotel_id, (start_date, end_date))
+        if cached is not None:
+            return cached
+        
         try:
-            # First get all rooms for the hotel
             from app.services.room_service import RoomService
-            all_rooms = await RoomService.get_rooms_by_hotel(hotel_id)
-            
-            available_rooms = []
-            for room in all_rooms:
-                is_available = await ReservationService.check_room_availability(
-                    str(room.id), start_date, end_date
-                )
-                if is_available:
-                    available_rooms.append(room)
-            
+            version = availability_cache.version(hotel_id)
+            booked_room_ids = await ReservationService.get_booked_room_ids(hotel_id, start_date, end_date)
+            available_rooms = await RoomService.get_rooms_by_hotel(hotel_id, exclude_room_ids=booked_room_ids)
+            availability_cache.set(hotel_id, (start_date, end_date), available_rooms, version=version)
             return available_rooms
-        except Exception as e:
-            print(f"Error getting available rooms: {e}")
+        except Exception:
+            logger.exception("Error getting available rooms")
             return []
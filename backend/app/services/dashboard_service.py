@@ -0,0 +1,70 @@
+import asyncio
+
+from app.models.booking import ReservationStatus
+from app.models.dashboard import DashboardStats, HotelAdminDashboardStats
+from app.models.user import User
+from app.services.activity_service import ActivityService
+from app.services.stats_service import StatsService, GLOBAL_SCOPE, admin_scope, hotel_scope
+
+RECENT_ACTIVITY = 5
+HOTEL_ADMIN_RECENT_ACTIVITY = 6
+
+
+class DashboardService:
+    @staticmethod
+    async def get_stats(current_user: User) -> DashboardStats:
+        """
+        Read the admin dashboard statistics from the stats counters and activity feed
+
+        Counts and revenue are O(1) reads of the counters StatsService keeps
+        up to date on every write; recent activity is one top-N read of the
+        activity feed. Scoping matches the previous behaviour: hotel admins
+        see users of their hotel, the hotels they created and those hotels'
+        reservations.
+        """
+        is_hotel_admin = current_user.role == "admin_hotel"
+        user_scoped = is_hotel_admin and current_user.hotel_id
+        if is_hotel_admin:
+            feed_scopes = [admin_scope(str(current_user.id))]
+            if user_scoped:
+                feed_scopes.append(hotel_scope(current_user.hotel_id))
+        else:
+            feed_scopes = [GLOBAL_SCOPE]
+
+        counters, user_counters, recent_activity = await asyncio.gather(
+            StatsService.get(admin_scope(str(current_user.id)) if is_hotel_admin else GLOBAL_SCOPE),
+            StatsService.get(hotel_scope(current_user.hotel_id) if user_scoped else GLOBAL_SCOPE),
+            ActivityService.get_feed(feed_scopes, RECENT_ACTIVITY)
+        )
+
+        return DashboardStats(
+            total_users=user_counters["users"],
+            total_hotels=counters["hotels"],
+            total_bookings=counters["reservations"],
+            total_revenue=counters["revenue"],
+            active_hotels=counters["active_hotels"],
+            pending_bookings=counters["by_status"].get(ReservationStatus.PENDING.value, 0),
+            recent_activity=recent_activity
+        )
+
+    @staticmethod
+    async def get_hotel_admin_stats(current_user: User) -> HotelAdminDashboardStats:
+        """
+        Read a hotel admin's dashboard: their totals and recent activity
+
+        Totals come from the admin's stats counters and the activity is the
+        newest events of the admin's feed (their hotels and the bookings at
+        them), so neither read depends on how many hotels or reservations
+        the admin has.
+        """
+        scope = admin_scope(str(current_user.id))
+        counters, recent_activity = await asyncio.gather(
+            StatsService.get(scope),
+            ActivityService.get_feed([scope], HOTEL_ADMIN_RECENT_ACTIVITY)
+        )
+
+        return HotelAdminDashboardStats(
+            my_hotels=counters["hotels"],
+            total_reservations=counters["reservations"],
+            recent_activity=recent_activity
+        )
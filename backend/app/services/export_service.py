@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from beanie import Document
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+from app.core.read_models import response_projection
+from app.models.booking import Reservation, ReservationResponse
+from app.models.hotel import Hotel, HotelResponse
+from app.models.room import Room, RoomResponse
+from app.models.user import User, UserResponse
+
+# Documents fetched per cursor round trip and rows emitted per response chunk
+EXPORT_BATCH_SIZE = 500
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def _created_between(start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+    created_at = {}
+    if start_date:
+        created_at["$gte"] = datetime.fromisoformat(start_date)
+    if end_date:
+        created_at["$lt"] = datetime.fromisoformat(end_date)
+    return {"created_at": created_at} if created_at else {}
+
+
+def _hotel_filter(hotel_id: Optional[str], hotel_ids: Optional[List[str]]) -> Dict[str, Any]:
+    if hotel_id:
+        return {"hotel_id": hotel_id}
+    if hotel_ids is not None:
+        return {"hotel_id": {"$in": hotel_ids}}
+    return {}
+
+
+class ExportService:
+    @staticmethod
+    async def stream(
+        document: Type[Document],
+        response_model: Type[BaseModel],
+        query: Dict[str, Any],
+        format: str = "ndjson"
+    ) -> AsyncIterator[str]:
+        """
+        Stream a collection as NDJSON or CSV text chunks
+        
+        The Motor cursor is consumed in EXPORT_BATCH_SIZE batches and every
+        chunk is yielded as soon as it is full, so memory stays flat no
+        matter how many documents match.
+        """
+        columns = ["id"] + list(response_projection(response_model))
+        cursor = document.get_motor_collection().find(
+            query, response_projection(response_model)
+        ).sort("_id", ASCENDING).batch_size(EXPORT_BATCH_SIZE)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == "csv":
+            writer.writerow(columns)
+
+        rows = 0
+        async for doc in cursor:
+            doc["id"] = str(doc.pop("_id"))
+            if format == "csv":
+                writer.writerow([_csv_value(doc.get(column)) for column in columns])
+            else:
+                buffer.write(json.dumps({column: doc.get(column) for column in columns}, default=_json_default))
+                buffer.write("\n")
+
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def export_reservations(
+        format: str,
+        hotel_id: Optional[str] = None,
+        hotel_ids: Optional[List[str]] = None,
+        status: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Reservations, optionally by hotel, status and stays overlapping [start_date, end_date]"""
+        query = _hotel_filter(hotel_id, hotel_ids)
+        if status:
+            query["status"] = status
+        if end_date:
+            query["start_date"] = {"$lte": end_date}
+        if start_date:
+            query["end_date"] = {"$gte": start_date}
+        return ExportService.stream(Reservation, ReservationResponse, query, format)
+
+    @staticmethod
+    def export_hotels(
+        format: str,
+        created_by: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Hotels, optionally by creator and creation date"""
+        query = _created_between(start_date, end_date)
+        if created_by:
+            query["created_by"] = created_by
+        return ExportService.stream(Hotel, HotelResponse, query, format)
+
+    @staticmethod
+    def export_rooms(
+        format: str,
+        hotel_id: Optional[str] = None,
+        hotel_ids: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Rooms, optionally by hotel and creation date"""
+        query = {**_hotel_filter(hotel_id, hotel_ids), **_created_between(start_date, end_date)}
+        return ExportService.stream(Room, RoomResponse, query, format)
+
+    @staticmethod
+    def export_users(
+        format: str,
+        hotel_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Users (never their password hashes), optionally by hotel and creation date"""
+        query = {**_hotel_filter(hotel_id, None), **_created_between(start_date, end_date)}
+        return ExportService.stream(User, UserResponse, query, format)
+
+    @staticmethod
+    async def get_hotel_ids_by_creator(creator_id: str) -> List[str]:
+        """Ids of the hotels a hotel admin created, used to scope their exports"""
+        hotel_ids = await Hotel.get_motor_collection().distinct("_id", {"created_by": creator_id})
+        return [str(hotel_id) for hotel_id in hotel_ids]
@@ -1,7 +1,16 @@
 from typing import List, Optional
 from datetime import datetime
 from beanie import PydanticObjectId
+from bson import ObjectId
 from app.models.hotel import Hotel, HotelCreate, HotelUpdate, HotelResponse
+from app.models.batch import BatchResponse
+from app.core.fields import Fields
+from app.core.read_models import find_one_response, find_responses, find_responses_by_ids, find_revision
+from app.core.responses import serialized_cache
+from app.services.revision_service import RevisionService, HOTELS_SCOPE
+from app.services.loaders import hotel_loader, hotel_ref_loader
+from app.services.stats_service import StatsService
+from app.services.activity_service import ActivityService
 
 
 class HotelService:
@@ -11,9 +20,13 @@ class HotelService:
         hotel_dict = hotel_data.model_dump()
         if creator_id:
             hotel_dict["created_by"] = creator_id
+        hotel_dict["updated_at"] = datetime.utcnow()
 
         hotel = Hotel(**hotel_dict)
         await hotel.create()
+        await RevisionService.bump(HOTELS_SCOPE)
+        await StatsService.record_hotel(hotel.created_by, hotel.is_active)
+        await ActivityService.record_hotel(hotel.name, hotel.city, hotel.created_by)
         
         # Use model_validate to create response from hotel document
         return HotelResponse.model_validate({
@@ -22,35 +35,44 @@ class HotelService:
         })
 
     @staticmethod
-    async def get_hotel(hotel_id: str) -> Optional[HotelResponse]:
-        """Get a hotel by ID"""
+    async def get_hotel(hotel_id: str, fields: Optional[Fields] = None) -> Optional[HotelResponse]:
+        """Get a hotel by ID (only the given fields when set; full hotels go through the batching loader)"""
         try:
-            hotel = await Hotel.get(PydanticObjectId(hotel_id))
-            if hotel:
-                return HotelResponse.model_validate({
-                    **hotel.model_dump(),
-                    "id": str(hotel.id)
-                })
+            if fields is None:
+                return await hotel_loader.load(hotel_id)
+            return await find_one_response(Hotel, HotelResponse, hotel_id, fields=fields)
         except Exception:
             return None
-        return None
 
     @staticmethod
-    async def get_hotels(skip: int = 0, limit: int = 100, active_only: bool = True) -> List[HotelResponse]:
-        """Get all hotels with pagination"""
-        query = Hotel.find()
-        if active_only:
-            query = Hotel.find(Hotel.is_active == True)
-        
-        hotels = await query.skip(skip).limit(limit).to_list()
-        
-        return [
-            HotelResponse.model_validate({
-                **hotel.model_dump(),
-                "id": str(hotel.id)
-            })
-            for hotel in hotels
-        ]
+    async def get_hotels_by_ids(hotel_ids: List[str]) -> BatchResponse[HotelResponse]:
+        """Get many hotels by ID in one query, in request order, reporting missing ids"""
+        items, missing = await find_responses_by_ids(Hotel, HotelResponse, hotel_ids)
+        return BatchResponse[HotelResponse](items=items, missing=missing)
+
+    @staticmethod
+    async def get_hotel_revision(hotel_id: str) -> Optional[int]:
+        """Get only a hotel's revision (for conditional requests)"""
+        try:
+            return await find_revision(Hotel, hotel_id)
+        except Exception:
+            return None
+
+    @staticmethod
+    async def get_hotels(
+        skip: int = 0,
+        limit: int = 100,
+        active_only: bool = True,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[HotelResponse]:
+        """Get all hotels with pagination (skip/limit or keyset after_id)"""
+        query = {"is_active": True} if active_only else {}
+        return await find_responses(
+            Hotel, HotelResponse, query,
+            skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+        )
 
     @staticmethod
     async def update_hotel(hotel_id: str, hotel_data: HotelUpdate) -> Optional[HotelResponse]:
@@ -63,14 +85,20 @@ class HotelService:
             update_data = {k: v for k, v in hotel_data.model_dump(exclude_unset=True).items() if v is not None}
             
             if update_data:
-                await hotel.update({"$set": update_data})
+                was_active = hotel.is_active
+                update_data["updated_at"] = datetime.utcnow()
+                await hotel.update({"$set": update_data, "$inc": {"revision": 1}})
+                serialized_cache.pop(("hotel", hotel_id))
+                hotel_loader.clear(hotel_id)
+                hotel_ref_loader.clear(hotel_id)
+                await RevisionService.bump(HOTELS_SCOPE)
+                if update_data.get("is_active", was_active) != was_active:
+                    await StatsService.record_hotel(
+                        hotel.created_by, True, sign=1 if update_data["is_active"] else -1, active_only=True
+                    )
                 
                 # Fetch updated hotel
-                updated_hotel = await Hotel.get(PydanticObjectId(hotel_id))
-                return HotelResponse.model_validate({
-                    **updated_hotel.model_dump(),
-                    "id": str(updated_hotel.id)
-                })
+                return await find_one_response(Hotel, HotelResponse, hotel_id)
         except Exception:
             return None
         return None
@@ -82,6 +110,12 @@ class HotelService:
             hotel = await Hotel.get(PydanticObjectId(hotel_id))
             if hotel:
                 await hotel.delete()
+                serialized_cache.pop(("hotel", hotel_id))
+                hotel_loader.clear(hotel_id)
+                hotel_ref_loader.clear(hotel_id)
+                await RevisionService.bump(HOTELS_SCOPE)
+                await StatsService.record_hotel(hotel.created_by, hotel.is_active, sign=-1)
+                await StatsService.remove_hotel_reservations(hotel_id, hotel.created_by)
                 return True
         except Exception:
             pass
@@ -97,25 +131,10 @@ class HotelService:
         if country:
             query["country"] = {"$regex": country, "$options": "i"}
         
-        hotels = await Hotel.find(query).to_list()
-        
-        return [
-            HotelResponse.model_validate({
-                **hotel.model_dump(),
-                "id": str(hotel.id)
-            })
-            for hotel in hotels
-        ]
+        return await find_responses(Hotel, HotelResponse, query)
     
 
     @staticmethod
     async def get_hotels_by_creator(creator_id: str) -> List[HotelResponse]:
-            hotels = await Hotel.find(Hotel.created_by == creator_id).to_list()
-            
-            return [
-                HotelResponse.model_validate({
-                    **hotel.model_dump(),
-                    "id": str(hotel.id)
-                })
-                for hotel in hotels
-            ]
+        """Get the hotels created by a hotel admin"""
+        return await find_responses(Hotel, HotelResponse, {"created_by": creator_id})
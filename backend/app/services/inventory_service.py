@@ -0,0 +1,176 @@
+import asyncio
+import calendar
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core.dates import stay_nights
+from app.models.inventory import HotelInventory
+
+logger = logging.getLogger(__name__)
+
+
+def nights_by_month(start_date: str, end_date: str) -> Dict[str, List[int]]:
+    """Group the nights of a stay (check-out day excluded) as {YYYY-MM: [zero-based day indexes]}"""
+    nights = defaultdict(list)
+    for night in stay_nights(start_date, end_date):
+        nights[night.strftime("%Y-%m")].append(night.day - 1)
+    return nights
+
+
+class InventoryService:
+    @staticmethod
+    async def claim(hotel_id: str, capacity: Optional[int], start_date: str, end_date: str) -> bool:
+        """
+        Take one unit of the hotel's capacity for every night of the stay
+        
+        Each month document is incremented only if all of its affected nights
+        are still below capacity, so concurrent claims cannot overbook. Months
+        already taken are given back when a later month is full. Passing
+        capacity=None increments unconditionally (used to restore a release).
+        """
+        collection = HotelInventory.get_motor_collection()
+        claimed = []
+        for month, days in nights_by_month(start_date, end_date).items():
+            await InventoryService._ensure_month(hotel_id, month)
+
+            query = {"hotel_id": hotel_id, "month": month}
+            if capacity is not None:
+                query.update({f"nights.{d}": {"$lt": capacity} for d in days})
+            result = await collection.update_one(query, {"$inc": {f"nights.{d}": 1 for d in days}})
+
+            if result.modified_count == 0:
+                for claimed_month, claimed_days in claimed:
+                    await InventoryService._increment(hotel_id, claimed_month, claimed_days, -1)
+                return False
+            claimed.append((month, days))
+        return True
+
+    @staticmethod
+    async def claim_many(claims: Dict[Hashable, Tuple[str, int, str, str]]) -> Set[Hashable]:
+        """
+        Take hotel capacity for many stays, returning the keys of those that did not fit
+        
+        claims maps a caller's key to (hotel_id, capacity, start_date, end_date).
+        Missing month documents are created with one bulk upsert. The stays of
+        each hotel are then summed per month and taken with one conditional
+        $inc per hotel-month, all sent concurrently. When a hotel's combined
+        claim does not fit, its months already taken are given back and its
+        stays are claimed one by one, so only the stays that really do not fit
+        are rejected.
+        """
+        by_hotel: Dict[str, List[Hashable]] = defaultdict(list)
+        for key, (hotel_id, _, _, _) in claims.items():
+            by_hotel[hotel_id].append(key)
+        await InventoryService._ensure_months({
+            (hotel_id, month)
+            for hotel_id, _, start_date, end_date in claims.values()
+            for month in nights_by_month(start_date, end_date)
+        })
+
+        async def claim_hotel(hotel_id: str, keys: List[Hashable]) -> Set[Hashable]:
+            capacity = claims[keys[0]][1]
+            totals: Dict[str, Counter] = defaultdict(Counter)
+            for key in keys:
+                _, _, start_date, end_date = claims[key]
+                for month, days in nights_by_month(start_date, end_date).items():
+                    totals[month].update(days)
+
+            async def claim_month(month: str, counts: Counter) -> bool:
+                query = {"hotel_id": hotel_id, "month": month}
+                query.update({f"nights.{d}": {"$lte": capacity - count} for d, count in counts.items()})
+                result = await HotelInventory.get_motor_collection().update_one(
+                    query, {"$inc": {f"nights.{d}": count for d, count in counts.items()}}
+                )
+                return result.modified_count == 1
+
+            taken = await asyncio.gather(*(claim_month(month, counts) for month, counts in totals.items()))
+            if all(taken):
+                return set()
+
+            for (month, counts), month_taken in zip(totals.items(), taken):
+                if month_taken:
+                    await HotelInventory.get_motor_collection().update_one(
+                        {"hotel_id": hotel_id, "month": month},
+                        {"$inc": {f"nights.{d}": -count for d, count in counts.items()}}
+                    )
+            rejected = set()
+            for key in keys:
+                _, _, start_date, end_date = claims[key]
+                if not await InventoryService.claim(hotel_id, capacity, start_date, end_date):
+                    rejected.add(key)
+            return rejected
+
+        results = await asyncio.gather(*(claim_hotel(hotel_id, keys) for hotel_id, keys in by_hotel.items()))
+        return set().union(*results)
+
+    @staticmethod
+    async def release(hotel_id: str, start_date: str, end_date: str) -> None:
+        """Give back the nights taken by claim()"""
+        for month, days in nights_by_month(start_date, end_date).items():
+            await InventoryService._increment(hotel_id, month, days, -1)
+
+    @staticmethod
+    async def get_remaining_capacity(hotel_id: str, capacity: int, start_date: str, end_date: str) -> int:
+        """Smallest number of reservations the hotel can still take on any night of the stay"""
+        months = nights_by_month(start_date, end_date)
+        busiest = 0
+        cursor = HotelInventory.get_motor_collection().find(
+            {"hotel_id": hotel_id, "month": {"$in": list(months)}},
+            {"month": 1, "nights": 1}
+        )
+        async for doc in cursor:
+            nights = doc["nights"]
+            busiest = max([busiest] + [nights[d] for d in months[doc["month"]]])
+        return max(capacity - busiest, 0)
+
+    @staticmethod
+    async def _ensure_month(hotel_id: str, month: str) -> None:
+        year, month_number = (int(part) for part in month.split("-"))
+        days_in_month = calendar.monthrange(year, month_number)[1]
+        try:
+            await HotelInventory.get_motor_collection().update_one(
+                {"hotel_id": hotel_id, "month": month},
+                {"$setOnInsert": {"nights": [0] * days_in_month}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # Created concurrently by another request
+
+    @staticmethod
+    async def _ensure_months(months: Set[Tuple[str, str]]) -> None:
+        """_ensure_month for many (hotel_id, month) pairs with one unordered bulk upsert"""
+        if not months:
+            return
+        operations = []
+        for hotel_id, month in months:
+            year, month_number = (int(part) for part in month.split("-"))
+            operations.append(UpdateOne(
+                {"hotel_id": hotel_id, "month": month},
+                {"$setOnInsert": {"nights": [0] * calendar.monthrange(year, month_number)[1]}},
+                upsert=True
+            ))
+        try:
+            await HotelInventory.get_motor_collection().bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Months created concurrently by other requests are fine
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+
+    @staticmethod
+    async def _increment(hotel_id: str, month: str, days: List[int], delta: int) -> None:
+        """Adjust the given nights; decrements never take a night below zero"""
+        query = {"hotel_id": hotel_id, "month": month}
+        if delta < 0:
+            query.update({f"nights.{d}": {"$gte": -delta} for d in days})
+        result = await HotelInventory.get_motor_collection().update_one(
+            query, {"$inc": {f"nights.{d}": delta for d in days}}
+        )
+        if delta < 0 and result.matched_count == 0:
+            logger.warning(
+                "Inventory of hotel %s for %s would go negative, left unchanged (run rebuild_inventory)",
+                hotel_id, month
+            )
@@ -0,0 +1,18 @@
+from app.core.fields import sparse_model
+from app.core.loader import BatchLoader
+from app.models.hotel import Hotel, HotelResponse
+from app.models.room import Room, RoomResponse
+from app.models.user import User, UserResponse
+
+# Shared by the services so lookups from any of them coalesce into one $in query per tick
+hotel_loader = BatchLoader(Hotel, HotelResponse)
+room_loader = BatchLoader(Room, RoomResponse)
+user_loader = BatchLoader(User, UserResponse)
+
+# Narrow loaders for the booking path: existence checks and the few fields
+# bookings, counters and the activity feed read, without galleries or descriptions
+hotel_ref_loader = BatchLoader(
+    Hotel, sparse_model(HotelResponse, frozenset({"id", "name", "created_by", "max_reservations_capacity"}))
+)
+room_ref_loader = BatchLoader(Room, sparse_model(RoomResponse, frozenset({"id", "hotel_id"})))
+user_ref_loader = BatchLoader(User, sparse_model(UserResponse, frozenset({"id"})))
@@ -0,0 +1,91 @@
+import asyncio
+import calendar
+from datetime import date
+from typing import Dict, List
+
+from app.core.dates import day_ordinal
+from app.models.booking import Reservation
+from app.models.room import Room
+from app.models.occupancy import RoomOccupancy, OccupancyCalendar
+from app.services.booking_service import overlap_query
+
+
+def mask_to_runs(mask: int) -> List[List[int]]:
+    """Run-length encode a night bitmask as [first_day, nights] pairs (days 1-based)"""
+    runs = []
+    day = 0
+    while mask:
+        if mask & 1:
+            length = 0
+            while mask & 1:
+                mask >>= 1
+                length += 1
+            runs.append([day + 1, length])
+            day += length
+        else:
+            mask >>= 1
+            day += 1
+    return runs
+
+
+class OccupancyService:
+    @staticmethod
+    async def get_month_occupancy(hotel_id: str, month: str) -> OccupancyCalendar:
+        """
+        Build the room x night occupancy grid of a hotel for one month
+        
+        The month's reservations come from one range query; each one is
+        clipped to the month and OR-ed into its room's night bitmask, while
+        a difference array gives the booked rooms per night in one sweep.
+        """
+        year, month_number = (int(part) for part in month.split("-"))
+        days_in_month = calendar.monthrange(year, month_number)[1]
+        first_day = date(year, month_number, 1)
+        last_day = date(year, month_number, days_in_month)
+        first_ordinal = first_day.toordinal()
+
+        rooms, reservations = await asyncio.gather(
+            Room.get_motor_collection().find(
+                {"hotel_id": hotel_id}, {"room_number": 1}
+            ).sort("room_number", 1).to_list(length=None),
+            Reservation.get_motor_collection().find(
+                {"hotel_id": hotel_id, **overlap_query(first_day.isoformat(), last_day.isoformat())},
+                {"room_id": 1, "start_date": 1, "end_date": 1}
+            ).to_list(length=None)
+        )
+
+        masks: Dict[str, int] = {str(room["_id"]): 0 for room in rooms}
+        changes = [0] * (days_in_month + 1)
+        for reservation in reservations:
+            room_id = reservation["room_id"]
+            if room_id not in masks:
+                continue  # Room deleted since the booking
+            first = max(day_ordinal(reservation["start_date"]) - first_ordinal, 0)
+            last = min(day_ordinal(reservation["end_date"]) - first_ordinal, days_in_month)
+            if first >= last:
+                continue  # Checks out on the 1st, no night in this month
+            masks[room_id] |= ((1 << (last - first)) - 1) << first
+            changes[first] += 1
+            changes[last] -= 1
+
+        occupied_per_day = []
+        running = 0
+        for change in changes[:days_in_month]:
+            running += change
+            occupied_per_day.append(running)
+
+        return OccupancyCalendar(
+            hotel_id=hotel_id,
+            month=month,
+            days_in_month=days_in_month,
+            rooms=[
+                RoomOccupancy(
+                    room_id=str(room["_id"]),
+                    room_number=room["room_number"],
+                    mask=masks[str(room["_id"])],
+                    runs=mask_to_runs(masks[str(room["_id"])])
+                )
+                for room in rooms
+            ],
+            occupied_per_day=occupied_per_day
+        )
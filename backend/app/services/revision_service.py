@@ -0,0 +1,29 @@
+from pymongo import ReturnDocument
+
+from app.models.revision import Revision
+
+HOTELS_SCOPE = "hotels"
+
+
+def rooms_scope(hotel_id: str) -> str:
+    return f"rooms:{hotel_id}"
+
+
+class RevisionService:
+    @staticmethod
+    async def current(scope: str) -> int:
+        """Current revision of a scope (0 until its first write)"""
+        doc = await Revision.get_motor_collection().find_one({"scope": scope}, {"revision": 1, "_id": 0})
+        return doc["revision"] if doc else 0
+
+    @staticmethod
+    async def bump(scope: str) -> int:
+        """Record a write to a scope and return its new revision"""
+        doc = await Revision.get_motor_collection().find_one_and_update(
+            {"scope": scope},
+            {"$inc": {"revision": 1}},
+            projection={"revision": 1, "_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["revision"]
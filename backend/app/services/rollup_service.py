@@ -0,0 +1,245 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.dates import day_ordinal, stay_nights
+from app.models.booking import Reservation, ReservationStatus
+from app.models.rollup import (
+    HotelDayRollup, RollupDirtyRange, RollupLease, TimeseriesGranularity, TimeseriesPoint, TimeseriesResponse
+)
+
+logger = logging.getLogger(__name__)
+
+# Reservations whose nights are (or will be) stayed and paid for
+ROLLUP_STATUSES = [
+    ReservationStatus.CONFIRMED.value,
+    ReservationStatus.CHECKED_IN.value,
+    ReservationStatus.CHECKED_OUT.value
+]
+
+# Dirty hotels taken per refresh run
+REFRESH_BATCH = 1000
+
+# (hotel_id, start_date, end_date) of a stay whose nights changed
+StayRange = Tuple[str, str, str]
+
+
+def merge_ranges(ranges: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Merge [start_date, end_date) ranges that overlap or touch, in date order"""
+    merged: List[List[str]] = []
+    for start_date, end_date in sorted(ranges):
+        if merged and start_date <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end_date)
+        else:
+            merged.append([start_date, end_date])
+    return [(start_date, end_date) for start_date, end_date in merged]
+
+
+def period_start(day: date, granularity: TimeseriesGranularity) -> date:
+    if granularity == TimeseriesGranularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == TimeseriesGranularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+class RollupService:
+    @staticmethod
+    async def mark_dirty(ranges: Iterable[StayRange]) -> None:
+        """
+        Record stays whose nights need their rollups recomputed
+        
+        Each range is kept on its own (only ranges of one call that overlap
+        or touch are merged), so a refresh rewrites the changed days rather
+        than everything between them. Failures are logged, not raised
+        (rebuild_rollups repairs them).
+        """
+        by_hotel: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for hotel_id, start_date, end_date in ranges:
+            by_hotel[hotel_id].append((start_date, end_date))
+        docs = [
+            {"hotel_id": hotel_id, "start_date": start_date, "end_date": end_date}
+            for hotel_id, hotel_ranges in by_hotel.items()
+            for start_date, end_date in merge_ranges(hotel_ranges)
+        ]
+        if not docs:
+            return
+        try:
+            await RollupDirtyRange.get_motor_collection().insert_many(docs, ordered=False)
+        except Exception:
+            logger.exception("Failed to mark rollups dirty for hotels %s", sorted(by_hotel))
+
+    @staticmethod
+    async def recompute(hotel_id: str, start_date: str, end_date: str) -> None:
+        """Rewrite the day rollups of a hotel for the nights from start_date up to end_date"""
+        first = day_ordinal(start_date)
+        nights = day_ordinal(end_date) - first
+        if nights <= 0:
+            return
+        revenue = [0.0] * nights
+        room_nights = [0] * nights
+
+        # Stays overlapping the range: start before its end, end after its start
+        cursor = Reservation.get_motor_collection().find(
+            {
+                "hotel_id": hotel_id,
+                "status": {"$in": ROLLUP_STATUSES},
+                "start_date": {"$lt": end_date},
+                "end_date": {"$gt": start_date}
+            },
+            {"start_date": 1, "end_date": 1, "total_price": 1}
+        )
+        async for reservation in cursor:
+            stay = stay_nights(reservation["start_date"], reservation["end_date"])
+            nightly_price = reservation["total_price"] / len(stay)
+            for night in stay:
+                index = night.toordinal() - first
+                if 0 <= index < nights:
+                    revenue[index] += nightly_price
+                    room_nights[index] += 1
+
+        now = datetime.utcnow()
+        operations = []
+        for index in range(nights):
+            day = date.fromordinal(first + index).isoformat()
+            key = {"hotel_id": hotel_id, "day": day}
+            if room_nights[index]:
+                operations.append(ReplaceOne(
+                    key,
+                    {**key, "revenue": round(revenue[index], 2), "room_nights": room_nights[index], "updated_at": now},
+                    upsert=True
+                ))
+            else:
+                operations.append(DeleteOne(key))
+        await HotelDayRollup.get_motor_collection().bulk_write(operations, ordered=False)
+
+    @staticmethod
+    async def _acquire_lease(hotel_id: str, owner: str) -> bool:
+        """Take the hotel's lease unless another refresher holds an unexpired one"""
+        now = datetime.utcnow()
+        try:
+            await RollupLease.get_motor_collection().update_one(
+                {"hotel_id": hotel_id, "$or": [{"expires_at": {"$lt": now}}, {"owner": owner}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=settings.ROLLUP_LEASE_SECONDS)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False  # Held by another refresher
+        return True
+
+    @staticmethod
+    async def _release_lease(hotel_id: str, owner: str) -> None:
+        await RollupLease.get_motor_collection().delete_one({"hotel_id": hotel_id, "owner": owner})
+
+    @staticmethod
+    async def refresh(limit: int = REFRESH_BATCH) -> int:
+        """
+        Recompute the rollups of up to limit dirty hotels, returning how many ranges were refreshed
+        
+        A hotel is only refreshed under its lease, so no two refreshers write
+        its rollups at once; hotels leased by another refresher are skipped
+        when picking the batch, so they do not crowd out the others. Its
+        ranges are read, merged where they overlap or touch, recomputed,
+        then deleted by _id: ranges marked meanwhile stay for the next run,
+        and so do the ranges of a failed recompute.
+        """
+        collection = RollupDirtyRange.get_motor_collection()
+        owner = uuid4().hex
+        leased = await RollupLease.get_motor_collection().distinct(
+            "hotel_id", {"expires_at": {"$gte": datetime.utcnow()}}
+        )
+        hotels = await collection.aggregate([
+            {"$match": {"hotel_id": {"$nin": leased}}},
+            {"$group": {"_id": "$hotel_id"}},
+            {"$limit": limit}
+        ]).to_list(None)
+
+        refreshed = 0
+        for hotel in hotels:
+            hotel_id = hotel["_id"]
+            if not await RollupService._acquire_lease(hotel_id, owner):
+                continue
+            try:
+                dirty = await collection.find({"hotel_id": hotel_id}).to_list(None)
+                for start_date, end_date in merge_ranges([(doc["start_date"], doc["end_date"]) for doc in dirty]):
+                    await RollupService.recompute(hotel_id, start_date, end_date)
+                await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in dirty]}})
+                refreshed += len(dirty)
+            except Exception:
+                logger.exception("Failed to refresh rollups of hotel %s", hotel_id)
+            finally:
+                await RollupService._release_lease(hotel_id, owner)
+        return refreshed
+
+    @staticmethod
+    async def run_periodically(interval: float) -> None:
+        """Background task refreshing dirty rollups every interval seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                refreshed = await RollupService.refresh()
+                if refreshed:
+                    logger.debug("Refreshed rollups of %d dirty ranges", refreshed)
+            except Exception:
+                logger.exception("Rollup refresh failed")
+
+    @staticmethod
+    async def mark_all_dirty() -> int:
+        """Mark every hotel's full reservation history dirty (for a rebuild), returning the hotel count"""
+        rows = await Reservation.get_motor_collection().aggregate([
+            {"$group": {"_id": "$hotel_id", "start_date": {"$min": "$start_date"}, "end_date": {"$max": "$end_date"}}}
+        ]).to_list(None)
+        await RollupService.mark_dirty((row["_id"], row["start_date"], row["end_date"]) for row in rows)
+        return len(rows)
+
+    @staticmethod
+    async def get_timeseries(
+        start_date: str,
+        end_date: str,
+        granularity: TimeseriesGranularity,
+        hotel_ids: Optional[List[str]] = None
+    ) -> TimeseriesResponse:
+        """
+        Revenue and occupied room-nights per period from start_date to end_date (inclusive)
+        
+        Reads only the day rollups inside the window, summed per day in
+        MongoDB, so the cost follows the window rather than the reservation
+        history. hotel_ids=None covers every hotel. Periods without any
+        stay are returned as zeros; the first and last periods only count
+        the days inside the window.
+        """
+        match = {"day": {"$gte": start_date, "$lte": end_date}}
+        if hotel_ids is not None:
+            match["hotel_id"] = {"$in": hotel_ids}
+        rows = await HotelDayRollup.get_motor_collection().aggregate([
+            {"$match": match},
+            {"$group": {"_id": "$day", "revenue": {"$sum": "$revenue"}, "room_nights": {"$sum": "$room_nights"}}}
+        ]).to_list(None)
+
+        first, last = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        periods: Dict[date, List] = {}
+        day = first
+        while day <= last:
+            periods.setdefault(period_start(day, granularity), [0.0, 0])
+            day += timedelta(days=1)
+        for row in rows:
+            totals = periods[period_start(date.fromisoformat(row["_id"]), granularity)]
+            totals[0] += row["revenue"]
+            totals[1] += row["room_nights"]
+
+        return TimeseriesResponse(
+            granularity=granularity,
+            start_date=start_date,
+            end_date=end_date,
+            points=[
+                TimeseriesPoint(period_start=start.isoformat(), revenue=round(revenue, 2), room_nights=room_nights)
+                for start, (revenue, room_nights) in periods.items()
+            ]
+        )
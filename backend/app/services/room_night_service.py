@@ -0,0 +1,75 @@
+from typing import List, Optional, Set, Tuple
+
+from pymongo.errors import BulkWriteError
+
+from app.models.room_night import RoomNight
+
+
+class RoomNightService:
+    @staticmethod
+    async def claim(room_id: str, reservation_id: str, nights: List[str]) -> bool:
+        """
+        Lock the given nights of a room for a reservation, all or nothing
+        
+        Nights are inserted in order and the unique (room_id, date) index
+        rejects any night another reservation already holds; whatever was
+        inserted before the rejection is removed again.
+        """
+        if not nights:
+            return True
+
+        collection = RoomNight.get_motor_collection()
+        try:
+            await collection.insert_many(
+                [{"room_id": room_id, "date": night, "reservation_id": reservation_id} for night in nights],
+                ordered=True
+            )
+        except BulkWriteError:
+            await collection.delete_many({
+                "room_id": room_id,
+                "reservation_id": reservation_id,
+                "date": {"$in": nights}
+            })
+            return False
+        return True
+
+    @staticmethod
+    async def claim_many(claims: List[Tuple[str, str, List[str]]]) -> Set[str]:
+        """
+        Lock nights for several reservations with one unordered insert
+        
+        Takes (room_id, reservation_id, nights) tuples and returns the ids of the
+        reservations that lost at least one night; their other nights are unlocked.
+        """
+        docs = [
+            {"room_id": room_id, "date": night, "reservation_id": reservation_id}
+            for room_id, reservation_id, nights in claims
+            for night in nights
+        ]
+        if not docs:
+            return set()
+
+        collection = RoomNight.get_motor_collection()
+        try:
+            await collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {docs[error["index"]]["reservation_id"] for error in e.details["writeErrors"]}
+            await collection.delete_many({"reservation_id": {"$in": list(failed)}})
+            return failed
+        return set()
+
+    @staticmethod
+    async def release_many(reservation_ids: List[str]) -> None:
+        """Unlock all nights of several reservations with one delete"""
+        if reservation_ids:
+            await RoomNight.get_motor_collection().delete_many({"reservation_id": {"$in": reservation_ids}})
+
+    @staticmethod
+    async def release(reservation_id: str, nights: Optional[List[str]] = None) -> None:
+        """Unlock a reservation's nights (all of them unless a subset is given)"""
+        query = {"reservation_id": reservation_id}
+        if nights is not None:
+            if not nights:
+                return
+            query["date"] = {"$in": nights}
+        await RoomNight.get_motor_collection().delete_many(query)
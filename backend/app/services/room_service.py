@@ -1,9 +1,16 @@
 from typing import List, Optional
 from datetime import datetime
 from beanie import PydanticObjectId
+from bson import ObjectId
 
 from app.models.room import Room, RoomCreate, RoomUpdate, RoomResponse
-from app.models.hotel import Hotel
+from app.models.batch import BatchResponse
+from app.services.booking_service import availability_cache
+from app.core.fields import Fields
+from app.core.read_models import find_one_response, find_responses, find_responses_by_ids, find_revision
+from app.core.responses import serialized_cache
+from app.services.revision_service import RevisionService, rooms_scope
+from app.services.loaders import hotel_ref_loader, room_loader, room_ref_loader
 
 
 class RoomService:
@@ -12,7 +19,7 @@ class RoomService:
         """Create a new room"""
         try:
             # Verify hotel exists
-            hotel = await Hotel.get(PydanticObjectId(room_data.hotel_id))
+            hotel = await hotel_ref_loader.load(room_data.hotel_id)
             if not hotel:
                 return None
             
@@ -24,8 +31,10 @@ class RoomService:
             if existing_room:
                 return None  # Room number already exists
             
-            room = Room(**room_data.model_dump())
+            room = Room(**room_data.model_dump(), updated_at=datetime.utcnow())
             await room.create()
+            availability_cache.bump(room.hotel_id)
+            await RevisionService.bump(rooms_scope(room.hotel_id))
             
             return RoomResponse.model_validate({
                 **room.model_dump(),
@@ -35,54 +44,62 @@ class RoomService:
             return None
 
     @staticmethod
-    async def get_room(room_id: str) -> Optional[RoomResponse]:
-        """Get a room by ID"""
+    async def get_room(room_id: str, fields: Optional[Fields] = None) -> Optional[RoomResponse]:
+        """Get a room by ID (only the given fields when set; full rooms go through the batching loader)"""
         try:
-            room = await Room.get(PydanticObjectId(room_id))
-            if room:
-                return RoomResponse.model_validate({
-                    **room.model_dump(),
-                    "id": str(room.id)
-                })
+            if fields is None:
+                return await room_loader.load(room_id)
+            return await find_one_response(Room, RoomResponse, room_id, fields=fields)
         except Exception:
             return None
-        return None
 
     @staticmethod
-    async def get_rooms(skip: int = 0, limit: int = 100, available_only: bool = False) -> List[RoomResponse]:
-        """Get all rooms with pagination"""
-        query = Room.find()
-        if available_only:
-            query = Room.find(Room.is_available == True)
-        
-        rooms = await query.skip(skip).limit(limit).to_list()
-        
-        return [
-            RoomResponse.model_validate({
-                **room.model_dump(),
-                "id": str(room.id)
-            })
-            for room in rooms
-        ]
+    async def get_rooms_by_ids(room_ids: List[str]) -> BatchResponse[RoomResponse]:
+        """Get many rooms by ID in one query, in request order, reporting missing ids"""
+        items, missing = await find_responses_by_ids(Room, RoomResponse, room_ids)
+        return BatchResponse[RoomResponse](items=items, missing=missing)
+
+    @staticmethod
+    async def get_room_revision(room_id: str) -> Optional[int]:
+        """Get only a room's revision (for conditional requests)"""
+        try:
+            return await find_revision(Room, room_id)
+        except Exception:
+            return None
 
     @staticmethod
-    async def get_rooms_by_hotel(hotel_id: str, available_only: bool = False) -> List[RoomResponse]:
-        """Get rooms by hotel ID"""
+    async def get_rooms(
+        skip: int = 0,
+        limit: int = 100,
+        available_only: bool = False,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[RoomResponse]:
+        """Get all rooms with pagination (skip/limit or keyset after_id)"""
+        query = {"is_available": True} if available_only else {}
+        return await find_responses(
+            Room, RoomResponse, query,
+            skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+        )
+
+    @staticmethod
+    async def get_rooms_by_hotel(
+        hotel_id: str,
+        available_only: bool = False,
+        exclude_room_ids: Optional[List[str]] = None,
+        fields: Optional[Fields] = None
+    ) -> List[RoomResponse]:
+        """Get rooms by hotel ID, optionally leaving out the given room ids"""
         try:
             # Build the query using string hotel_id
             query = {"hotel_id": hotel_id}
             if available_only:
                 query["is_available"] = True
+            if exclude_room_ids:
+                query["_id"] = {"$nin": [PydanticObjectId(rid) for rid in exclude_room_ids if ObjectId.is_valid(rid)]}
             
-            rooms = await Room.find(query).to_list()
-            
-            return [
-                RoomResponse.model_validate({
-                    **room.model_dump(),
-                    "id": str(room.id)
-                })
-                for room in rooms
-            ]
+            return await find_responses(Room, RoomResponse, query, fields=fields)
         except Exception as e:
             print(f"Error in get_rooms_by_hotel: {e}")
             return []
@@ -108,14 +125,16 @@ class RoomService:
                     if existing_room:
                         return None  # Room number already exists
                 
-                await room.update({"$set": update_data})
+                update_data["updated_at"] = datetime.utcnow()
+                await room.update({"$set": update_data, "$inc": {"revision": 1}})
+                availability_cache.bump(room.hotel_id)
+                serialized_cache.pop(("room", room_id))
+                room_loader.clear(room_id)
+                room_ref_loader.clear(room_id)
+                await RevisionService.bump(rooms_scope(room.hotel_id))
                 
                 # Fetch updated room
-                updated_room = await Room.get(PydanticObjectId(room_id))
-                return RoomResponse.model_validate({
-                    **updated_room.model_dump(),
-                    "id": str(updated_room.id)
-                })
+                return await find_one_response(Room, RoomResponse, room_id)
         except Exception:
             return None
         return None
@@ -127,6 +146,11 @@ class RoomService:
             room = await Room.get(PydanticObjectId(room_id))
             if room:
                 await room.delete()
+                availability_cache.bump(room.hotel_id)
+                serialized_cache.pop(("room", room_id))
+                room_loader.clear(room_id)
+                room_ref_loader.clear(room_id)
+                await RevisionService.bump(rooms_scope(room.hotel_id))
                 return True
         except Exception:
             pass
@@ -0,0 +1,103 @@
+import re
+from typing import Optional
+
+from app.models.hotel import Hotel
+from app.models.room import Room, RoomType
+from app.models.booking import Reservation
+from app.models.search import HotelAvailability, AvailabilitySearchResponse
+from app.services.booking_service import overlap_query
+
+
+class SearchService:
+    @staticmethod
+    async def search_availability(
+        start_date: str,
+        end_date: str,
+        city: Optional[str] = None,
+        country: Optional[str] = None,
+        room_type: Optional[RoomType] = None,
+        min_occupancy: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> AvailabilitySearchResponse:
+        """
+        Find hotels with free rooms matching the criteria for the given dates
+        
+        Everything runs in one aggregation over hotels: matching rooms are
+        joined per hotel, rooms with an overlapping reservation are dropped,
+        and the free ones are reduced to a count and the cheapest nightly price.
+        The joins use localField/foreignField with a sub-pipeline, so they hit
+        the rooms.hotel_id and reservations.room_id indexes (MongoDB 5.0+).
+        """
+        hotel_match = {"is_active": True}
+        if city:
+            hotel_match["city"] = {"$regex": re.escape(city), "$options": "i"}
+        if country:
+            hotel_match["country"] = {"$regex": re.escape(country), "$options": "i"}
+
+        room_match = {"is_available": True}
+        if room_type:
+            room_match["type"] = room_type.value
+        if min_occupancy:
+            room_match["max_occupancy"] = {"$gte": min_occupancy}
+
+        pipeline = [
+            {"$match": hotel_match},
+            {"$addFields": {"hotel_key": {"$toString": "$_id"}}},
+            {"$lookup": {
+                "from": Room.get_motor_collection().name,
+                "localField": "hotel_key",
+                "foreignField": "hotel_id",
+                "pipeline": [
+                    {"$match": room_match},
+                    {"$addFields": {"room_key": {"$toString": "$_id"}}},
+                    {"$lookup": {
+                        "from": Reservation.get_motor_collection().name,
+                        "localField": "room_key",
+                        "foreignField": "room_id",
+                        "pipeline": [
+                            {"$match": overlap_query(start_date, end_date)},
+                            {"$limit": 1},
+                            {"$project": {"_id": 1}}
+                        ],
+                        "as": "conflicts"
+                    }},
+                    {"$match": {"conflicts": {"$size": 0}}},
+                    {"$project": {"price_per_night": 1}}
+                ],
+                "as": "free_rooms"
+            }},
+            {"$project": {
+                "name": 1,
+                "city": 1,
+                "country": 1,
+                "available_rooms": {"$size": "$free_rooms"},
+                "cheapest_price": {"$min": "$free_rooms.price_per_night"}
+            }},
+            {"$match": {"available_rooms": {"$gt": 0}}},
+            {"$sort": {"cheapest_price": 1, "_id": 1}},
+            {"$facet": {
+                "items": [{"$skip": skip}, {"$limit": limit}],
+                "total": [{"$count": "count"}]
+            }}
+        ]
+
+        result = await Hotel.get_motor_collection().aggregate(pipeline).to_list(length=1)
+        page = result[0] if result else {"items": [], "total": []}
+
+        return AvailabilitySearchResponse(
+            items=[
+                HotelAvailability(
+                    hotel_id=str(doc["_id"]),
+                    name=doc["name"],
+                    city=doc["city"],
+                    country=doc["country"],
+                    available_rooms=doc["available_rooms"],
+                    cheapest_price=doc["cheapest_price"]
+                )
+                for doc in page["items"]
+            ],
+            total=page["total"][0]["count"] if page["total"] else 0,
+            skip=skip,
+            limit=limit
+        )
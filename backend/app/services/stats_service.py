@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Iterable, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.models.stats import Stats
+from app.services.loaders import hotel_ref_loader
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+
+# Counter fields read by the dashboards (by_status.<status> is nested)
+COUNTER_FIELDS = ("users", "hotels", "active_hotels", "reservations", "revenue")
+
+Deltas = Dict[str, float]
+
+
+def hotel_scope(hotel_id: str) -> str:
+    return f"hotel:{hotel_id}"
+
+
+def admin_scope(creator_id: str) -> str:
+    return f"admin:{creator_id}"
+
+
+def _status_key(status) -> str:
+    return status.value if isinstance(status, Enum) else str(status)
+
+
+def reservation_deltas(status, total_price: float, sign: int = 1) -> Deltas:
+    """Counter changes for adding (sign=1) or removing (sign=-1) one reservation"""
+    return {
+        "reservations": sign,
+        f"by_status.{_status_key(status)}": sign,
+        "revenue": sign * total_price
+    }
+
+
+class StatsService:
+    @staticmethod
+    async def increment(changes: Dict[str, Deltas]) -> None:
+        """
+        Apply counter deltas per scope with one unordered bulk $inc
+        
+        Counter failures are logged, never raised: the write that caused them
+        has already happened, and reconcile_stats repairs any drift.
+        """
+        operations = [
+            UpdateOne(
+                {"scope": scope},
+                {"$inc": deltas, "$set": {"updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+            for scope, deltas in changes.items()
+            if any(deltas.values())
+        ]
+        if not operations:
+            return
+        try:
+            await Stats.get_motor_collection().bulk_write(operations, ordered=False)
+        except Exception:
+            logger.exception("Failed to update stats counters for %s", sorted(changes))
+
+    @staticmethod
+    async def get(scope: str) -> Dict[str, float]:
+        """Counters of one scope, zeros when it was never written"""
+        doc = await Stats.get_motor_collection().find_one({"scope": scope}, {"_id": 0})
+        doc = doc or {}
+        return {
+            **{field: doc.get(field, 0) for field in COUNTER_FIELDS},
+            "by_status": doc.get("by_status", {})
+        }
+
+    @staticmethod
+    async def record_user(hotel_id: Optional[str], sign: int = 1) -> None:
+        changes = {GLOBAL_SCOPE: {"users": sign}}
+        if hotel_id:
+            changes[hotel_scope(hotel_id)] = {"users": sign}
+        await StatsService.increment(changes)
+
+    @staticmethod
+    async def move_user(old_hotel_id: Optional[str], new_hotel_id: Optional[str]) -> None:
+        """Move a user between hotel scopes when their hotel_id changes"""
+        if old_hotel_id == new_hotel_id:
+            return
+        changes = {}
+        if old_hotel_id:
+            changes[hotel_scope(old_hotel_id)] = {"users": -1}
+        if new_hotel_id:
+            changes[hotel_scope(new_hotel_id)] = {"users": 1}
+        await StatsService.increment(changes)
+
+    @staticmethod
+    async def record_hotel(created_by: Optional[str], is_active: bool, sign: int = 1, active_only: bool = False) -> None:
+        """Count a hotel in (sign=1) or out of (sign=-1) the totals; active_only moves only active_hotels"""
+        deltas = {"active_hotels": sign if is_active else 0}
+        if not active_only:
+            deltas["hotels"] = sign
+        changes = {GLOBAL_SCOPE: deltas}
+        if created_by:
+            changes[admin_scope(created_by)] = dict(deltas)
+        await StatsService.increment(changes)
+
+    @staticmethod
+    async def remove_hotel_reservations(hotel_id: str, created_by: Optional[str]) -> None:
+        """Take a deleted hotel's reservation counters out of its admin's scope"""
+        if not created_by:
+            return
+        counters = await StatsService.get(hotel_scope(hotel_id))
+        deltas = {
+            "reservations": -counters["reservations"],
+            "revenue": -counters["revenue"],
+            **{f"by_status.{status}": -count for status, count in counters["by_status"].items()}
+        }
+        await StatsService.increment({admin_scope(created_by): deltas})
+
+    @staticmethod
+    async def record_reservations(changes: Iterable[Tuple[str, Deltas]]) -> None:
+        """
+        Apply reservation counter deltas, given as (hotel_id, deltas) pairs
+        
+        Each change lands in the global, hotel and hotel-creator scopes; the
+        creators come from the batching hotel loader.
+        """
+        changes = list(changes)
+        hotel_ids = list({hotel_id for hotel_id, _ in changes})
+        hotels = await asyncio.gather(*(hotel_ref_loader.load(hotel_id) for hotel_id in hotel_ids))
+        creators = {hotel_id: hotel.created_by if hotel else None for hotel_id, hotel in zip(hotel_ids, hotels)}
+
+        totals: Dict[str, Deltas] = defaultdict(lambda: defaultdict(int))
+        for hotel_id, deltas in changes:
+            scopes = [GLOBAL_SCOPE, hotel_scope(hotel_id)]
+            if creators[hotel_id]:
+                scopes.append(admin_scope(creators[hotel_id]))
+            for scope in scopes:
+                for field, value in deltas.items():
+                    totals[scope][field] += value
+        await StatsService.increment({scope: dict(deltas) for scope, deltas in totals.items()})
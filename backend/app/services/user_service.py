@@ -1,9 +1,16 @@
 from typing import List, Optional
 from datetime import datetime
 from beanie import PydanticObjectId
+from bson import ObjectId
 
 from app.models.user import User, UserCreate, UserUpdate, UserResponse
+from app.models.batch import BatchResponse
 from app.core.security import get_password_hash, verify_password
+from app.core.fields import Fields
+from app.core.read_models import find_one_response, find_responses, find_responses_by_ids
+from app.services.loaders import user_loader, user_ref_loader
+from app.services.stats_service import StatsService
+from app.services.activity_service import ActivityService
 
 
 class UserService:
@@ -22,6 +29,8 @@ class UserService:
             user_dict = user_data.model_dump(exclude={"password"})
             user = User(**user_dict, hashed_password=hashed_password)
             await user.create()
+            await StatsService.record_user(user.hotel_id)
+            await ActivityService.record_user(user.name, user.email, user.hotel_id)
             
             return UserResponse.model_validate({
                 **user.model_dump(),
@@ -32,30 +41,52 @@ class UserService:
             raise e
 
     @staticmethod
-    async def get_user(user_id: str) -> Optional[UserResponse]:
-        """Get a user by ID"""
+    async def get_user(user_id: str, fields: Optional[Fields] = None) -> Optional[UserResponse]:
+        """Get a user by ID (only the given fields when set; full users go through the batching loader)"""
         try:
-            user = await User.get(PydanticObjectId(user_id))
-            if user:
-                return UserResponse.model_validate({
-                    **user.model_dump(),
-                    "id": str(user.id)
-                })
+            if fields is None:
+                return await user_loader.load(user_id)
+            return await find_one_response(User, UserResponse, user_id, fields=fields)
         except Exception:
             return None
-        return None
 
     @staticmethod
-    async def get_users(skip: int = 0, limit: int = 100) -> List[UserResponse]:
-        """Get all users with pagination"""
-        users = await User.find().skip(skip).limit(limit).to_list()
-        return [
-            UserResponse.model_validate({
-                **user.model_dump(),
-                "id": str(user.id)
-            })
-            for user in users
-        ]
+    def is_visible_to(user: UserResponse, viewer: User) -> bool:
+        """Whether viewer may see user's profile (same rules as GET /users/{id})"""
+        if str(viewer.id) == user.id or viewer.role == "super_admin":
+            return True
+        return viewer.role == "admin_hotel" and viewer.hotel_id is not None and viewer.hotel_id == user.hotel_id
+
+    @staticmethod
+    async def get_users_by_ids(user_ids: List[str], visible_to: User) -> BatchResponse[UserResponse]:
+        """
+        Get many users by ID in one query, in request order
+        
+        Only users visible_to may see (same rules as GET /users/{id}) are
+        returned; the others are reported as missing.
+        """
+        if visible_to.role == "viewer":
+            query = {"_id": visible_to.id}
+        elif visible_to.role == "admin_hotel":
+            query = {"$or": [{"hotel_id": visible_to.hotel_id}, {"_id": visible_to.id}]}
+        else:
+            query = {}
+        items, missing = await find_responses_by_ids(User, UserResponse, user_ids, query)
+        return BatchResponse[UserResponse](items=items, missing=missing)
+
+    @staticmethod
+    async def get_users(
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[UserResponse]:
+        """Get all users with pagination (skip/limit or keyset after_id)"""
+        return await find_responses(
+            User, UserResponse, {},
+            skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+        )
 
     @staticmethod
     async def update_user(user_id: str, user_data: UserUpdate) -> Optional[UserResponse]:
@@ -67,14 +98,15 @@ class UserService:
 
             update_data = {k: v for k, v in user_data.model_dump(exclude_unset=True).items() if v is not None}
             if update_data:
+                old_hotel_id = user.hotel_id
                 await user.update({"$set": update_data})
+                user_loader.clear(user_id)
+                user_ref_loader.clear(user_id)
+                if "hotel_id" in update_data:
+                    await StatsService.move_user(old_hotel_id, update_data["hotel_id"])
                 
                 # Fetch updated user
-                updated_user = await User.get(PydanticObjectId(user_id))
-                return UserResponse.model_validate({
-                    **updated_user.model_dump(),
-                    "id": str(updated_user.id)
-                })
+                return await find_one_response(User, UserResponse, user_id)
         except Exception:
             return None
         return None
@@ -86,6 +118,9 @@ class UserService:
             user = await User.get(PydanticObjectId(user_id))
             if user:
                 await user.delete()
+                user_loader.clear(user_id)
+                user_ref_loader.clear(user_id)
+                await StatsService.record_user(user.hotel_id, sign=-1)
                 return True
         except Exception:
             pass
@@ -128,13 +163,16 @@ class UserService:
         )
 
     @staticmethod
-    async def get_users_by_hotel(hotel_id: str, skip: int = 0, limit: int = 100) -> List[UserResponse]:
+    async def get_users_by_hotel(
+        hotel_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[ObjectId] = None,
+        fields: Optional[Fields] = None,
+        include_total: bool = False
+    ) -> List[UserResponse]:
         """Get all users for a specific hotel with pagination"""
-        users = await User.find(User.hotel_id == hotel_id).skip(skip).limit(limit).to_list()
-        return [
-            UserResponse.model_validate({
-                **user.model_dump(),
-                "id": str(user.id)
-            })
-            for user in users
-        ]
+        return await find_responses(
+            User, UserResponse, {"hotel_id": hotel_id},
+            skip=skip, limit=limit, after_id=after_id, fields=fields, include_total=include_total
+        )
@@ -1,25 +1,45 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.loader import RequestScopeMiddleware
 from app.api.api import api_router
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.core.responses import ETAG_HEADER
+from app.services.availability_index import availability_index
+from app.services.rollup_service import RollupService
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    setup_logging()
     await connect_to_mongo()
     print("Successfully Connected to MongoDB")
+    if settings.AVAILABILITY_INDEX_ENABLED:
+        await availability_index.build()
+    rollup_task = None
+    if settings.ROLLUP_REFRESH_INTERVAL_SECONDS > 0:
+        rollup_task = asyncio.create_task(RollupService.run_periodically(settings.ROLLUP_REFRESH_INTERVAL_SECONDS))
     yield
     # Shutdown
+    if rollup_task:
+        rollup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await rollup_task
     await close_mongo_connection()
+    shutdown_logging()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -31,8 +51,12 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, ETAG_HEADER],
     )
 
+# Per-request memo for the batching loaders
+app.add_middleware(RequestScopeMiddleware)
+
 app.include_router(api_router, prefix=settings.API_STR)
 
 